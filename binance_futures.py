@@ -1,23 +1,58 @@
 import requests
+try:
+    import orjson
+except ImportError:  # Fall back to requests' stdlib decoder
+    orjson = None
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import hmac
 import hashlib
 import time
-from urllib.parse import urlencode
+import numpy as np
 import pandas as pd
 import streamlit as st
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+# Candle length per supported interval, used to size default kline requests
+INTERVAL_MINUTES = {
+    '1m': 1,
+    '5m': 5,
+    '15m': 15,
+    '1h': 60,
+    '4h': 240,
+    '1d': 1440
+}
+MINUTES_IN_MONTH = 43200  # 30 days * 24 hours * 60 minutes
+
+# Worker pool for overlapping independent request round-trips. Shared by
+# every client, since clients are rebuilt on each Streamlit rerun, and sized
+# to the connection pool so concurrent timeframe fetches don't queue behind
+# each other's nested requests
+_REQUEST_EXECUTOR = ThreadPoolExecutor(max_workers=16)
+
 class BinanceFuturesClient:
     def __init__(self, api_key, api_secret):
         self.api_key = api_key
         self.api_secret = api_secret
+        # Keyed HMAC state; copied per signature to skip re-keying
+        self._hmac_prototype = hmac.new(api_secret.encode('utf-8'), digestmod=hashlib.sha256)
         # Changed back to testnet URL
         self.base_url = "https://testnet.binancefuture.com"
         self.api_v1_url = f"{self.base_url}/fapi/v1"
         self.api_v2_url = f"{self.base_url}/fapi/v2"
         self.symbol_info = {}
         self.current_symbol = None
+        # Persistent session so keep-alive reuses one connection across calls
+        self._session = requests.Session()
+        self._session.headers.update({'X-MBX-APIKEY': self.api_key})
+        # Retry only connection-level failures; POST orders are never replayed
+        self._session.mount(self.base_url, HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.1)
+        ))
         # Extended list of trading pairs
         self.allowed_pairs = [
             'BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'XRPUSDT', 'ADAUSDT', 
@@ -27,6 +62,8 @@ class BinanceFuturesClient:
             'SANDUSDT', 'MANAUSDT', 'APTUSDT', 'GMTUSDT', 'GALAUSDT',
             'FTMUSDT', 'AXSUSDT', 'RUNEUSDT', 'EOSUSDT', 'THETAUSDT'
         ]
+        # Hashed view of allowed_pairs for membership checks
+        self._allowed_pairs_set = frozenset(self.allowed_pairs)
         self._load_exchange_info()
 
     def get_current_symbol(self) -> str:
@@ -39,19 +76,22 @@ class BinanceFuturesClient:
             exchange_info = self._make_request('exchangeInfo')
             if exchange_info and 'symbols' in exchange_info:
                 for symbol in exchange_info['symbols']:
-                    if symbol['symbol'] in self.allowed_pairs:  # Solo cargar info de pares permitidos
+                    if symbol['symbol'] in self._allowed_pairs_set:  # Solo cargar info de pares permitidos
                         self.symbol_info[symbol['symbol']] = {
                             'quantityPrecision': symbol['quantityPrecision'],
-                            'pricePrecision': symbol['pricePrecision']
+                            'pricePrecision': symbol['pricePrecision'],
+                            # Format templates built once per symbol for order formatting
+                            'quantity_format': f"{{:.{symbol['quantityPrecision']}f}}",
+                            'price_format': f"{{:.{symbol['pricePrecision']}f}}"
                         }
         except Exception as e:
             print(f"Error loading exchange info: {str(e)}")
             print(f"Traceback: {traceback.format_exc()}")
 
-    def _format_number(self, number, precision):
-        """Format number to specified decimal precision"""
+    def _format_number(self, number, number_format):
+        """Format number with a precomputed precision template such as '{:.2f}'"""
         try:
-            return f"%.{precision}f" % float(number)
+            return number_format.format(float(number))
         except Exception as e:
             print(f"Error formatting number: {str(e)}")
             return str(number)
@@ -59,11 +99,10 @@ class BinanceFuturesClient:
     def _generate_signature(self, params):
         """Generate signature for authenticated requests"""
         try:
-            return hmac.new(
-                self.api_secret.encode('utf-8'),
-                urlencode(params).encode('utf-8'),
-                hashlib.sha256
-            ).hexdigest()
+            signature = self._hmac_prototype.copy()
+            # Order params are plain symbols/numbers, so they need no percent-encoding
+            signature.update('&'.join(f"{key}={value}" for key, value in params.items()).encode('utf-8'))
+            return signature.hexdigest()
         except Exception as e:
             print(f"Error generating signature: {str(e)}")
             return None
@@ -73,7 +112,6 @@ class BinanceFuturesClient:
         try:
             base_url = self.api_v2_url if version == 'v2' else self.api_v1_url
             url = f"{base_url}/{endpoint}"
-            headers = {'X-MBX-APIKEY': self.api_key}
             
             if params is None:
                 params = {}
@@ -84,9 +122,11 @@ class BinanceFuturesClient:
                 params['recvWindow'] = 5000
                 params['signature'] = self._generate_signature(params)
             
-            response = requests.request(method, url, headers=headers, params=params)
+            response = self._session.request(method, url, params=params)
             
             if response.status_code == 200:
+                if orjson is not None:
+                    return orjson.loads(response.content)
                 return response.json()
             else:
                 print(f"API Error: {response.status_code} - {response.text}")
@@ -116,30 +156,48 @@ class BinanceFuturesClient:
             elif end_time:
                 params['endTime'] = int(end_time * 1000)
 
+            # Fetch mark price concurrently with the klines request
+            mark_price_future = _REQUEST_EXECUTOR.submit(
+                self._make_request, 'premiumIndex', params={'symbol': symbol}
+            )
             klines = self._make_request('klines', params=params)
             
             if not klines:
                 return None
                 
-            # Create DataFrame
-            df = pd.DataFrame(klines, columns=[
+            # Create DataFrame column by column from the transposed rows,
+            # casting each numeric column once instead of per block
+            columns = [
                 'timestamp', 'open', 'high', 'low', 'close', 'volume',
                 'close_time', 'quote_volume', 'trades', 'taker_buy_base',
                 'taker_buy_quote', 'ignore'
-            ])
+            ]
+            # Prices and volumes stay float64 so SL/TP levels and summed or
+            # displayed volumes keep exchange precision; only the taker-buy
+            # columns and trade counts, which nothing sums, are downcast
+            numeric_dtypes = {
+                'open': np.float64, 'high': np.float64,
+                'low': np.float64, 'close': np.float64,
+                'volume': np.float64, 'quote_volume': np.float64,
+                'trades': np.int32, 'taker_buy_base': np.float32,
+                'taker_buy_quote': np.float32
+            }
+            rows = np.asarray(klines, dtype=object)
+            data = {}
+            for i, column in enumerate(columns[1:], start=1):
+                if column in numeric_dtypes:
+                    data[column] = rows[:, i].astype(numeric_dtypes[column])
+                elif column == 'close_time':
+                    data[column] = rows[:, i].astype(np.int64)
+                else:
+                    data[column] = rows[:, i]
             
             # Convert timestamp
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
-            
-            # Convert numeric columns
-            numeric_columns = ['open', 'high', 'low', 'close', 'volume', 
-                             'quote_volume', 'trades', 'taker_buy_base', 
-                             'taker_buy_quote']
-            df[numeric_columns] = df[numeric_columns].astype(float)
+            index = pd.to_datetime(rows[:, 0].astype(np.int64), unit='ms')
+            df = pd.DataFrame(data, index=index.rename('timestamp'))
             
             # Add mark price and funding rate columns
-            mark_price_info = self._make_request('premiumIndex', params={'symbol': symbol})
+            mark_price_info = mark_price_future.result()
             if mark_price_info:
                 df['mark_price'] = float(mark_price_info['markPrice'])
                 df['funding_rate'] = float(mark_price_info['lastFundingRate'])
@@ -181,6 +239,30 @@ class BinanceFuturesClient:
             print(f"Traceback: {traceback.format_exc()}")
             return ["BTCUSDT", "ETHUSDT", "BNBUSDT"]  # Default pairs if error
 
+    def get_last_price(self, symbol):
+        """Get the latest price for a single symbol"""
+        try:
+            ticker = self._make_request('ticker/price', params={'symbol': symbol})
+            if not ticker:
+                return None
+            return float(ticker['price'])
+        except Exception as e:
+            print(f"Error getting price for {symbol}: {str(e)}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return None
+
+    def get_all_prices(self):
+        """Get latest prices for all symbols in a single request"""
+        try:
+            tickers = self._make_request('ticker/price')
+            if not tickers:
+                return {}
+            return {ticker['symbol']: float(ticker['price']) for ticker in tickers}
+        except Exception as e:
+            print(f"Error getting prices: {str(e)}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return {}
+
     def get_market_data(self, symbol='BTCUSDT', interval='1h', limit=None):
         """Get market data"""
         try:
@@ -188,23 +270,22 @@ class BinanceFuturesClient:
             self.current_symbol = symbol
             
             # Verificar que el símbolo está en la lista de permitidos
-            if symbol not in self.allowed_pairs:
+            if symbol not in self._allowed_pairs_set:
                 print(f"Symbol {symbol} is not in allowed trading pairs")
                 return None
             
             # Calculate limit based on interval if not provided
             if limit is None:
                 # Calculate candles needed for 1 month based on interval
-                interval_minutes = {
-                    '1m': 1,
-                    '5m': 5,
-                    '15m': 15,
-                    '1h': 60,
-                    '4h': 240,
-                    '1d': 1440
-                }
-                minutes_in_month = 43200  # 30 days * 24 hours * 60 minutes
-                limit = min(1500, minutes_in_month // interval_minutes.get(interval, 60))
+                limit = min(1500, MINUTES_IN_MONTH // INTERVAL_MINUTES.get(interval, 60))
+            
+            # Start ticker and order book requests while klines are fetched
+            ticker_future = _REQUEST_EXECUTOR.submit(
+                self._make_request, 'ticker/24hr', params={'symbol': symbol}
+            )
+            depth_future = _REQUEST_EXECUTOR.submit(
+                self._make_request, 'depth', params={'symbol': symbol, 'limit': 5}
+            )
             
             # Get klines data
             df = self.get_historical_klines(
@@ -218,7 +299,7 @@ class BinanceFuturesClient:
                 return None
             
             # Get 24hr ticker
-            ticker = self._make_request('ticker/24hr', params={'symbol': symbol})
+            ticker = ticker_future.result()
             if ticker:
                 df['price_change'] = float(ticker['priceChange'])
                 df['price_change_percent'] = float(ticker['priceChangePercent'])
@@ -233,7 +314,7 @@ class BinanceFuturesClient:
                 df['last_qty'] = 0.0
             
             # Get order book
-            depth = self._make_request('depth', params={'symbol': symbol, 'limit': 5})
+            depth = depth_future.result()
             if depth and depth.get('bids') and depth.get('asks'):
                 df['top_bid_price'] = float(depth['bids'][0][0])
                 df['top_bid_qty'] = float(depth['bids'][0][1])
@@ -255,7 +336,7 @@ class BinanceFuturesClient:
         """Execute a trade"""
         try:
             # Verificar que el símbolo está en la lista de permitidos
-            if symbol not in self.allowed_pairs:
+            if symbol not in self._allowed_pairs_set:
                 print(f"Symbol {symbol} is not in allowed trading pairs")
                 return None
                 
@@ -270,7 +351,7 @@ class BinanceFuturesClient:
             precision_info = self.symbol_info[symbol]
             
             # Format quantity and prices according to symbol precision
-            formatted_quantity = self._format_number(quantity, precision_info['quantityPrecision'])
+            formatted_quantity = self._format_number(quantity, precision_info['quantity_format'])
             
             # Prepare order parameters
             params = {
@@ -281,38 +362,42 @@ class BinanceFuturesClient:
             }
             
             if price:
-                formatted_price = self._format_number(price, precision_info['pricePrecision'])
+                formatted_price = self._format_number(price, precision_info['price_format'])
                 params['price'] = formatted_price
                 params['timeInForce'] = 'GTC'
             
             # Place main order
             order = self._make_request('order', method='POST', params=params, signed=True)
             
-            # If order is successful and stop loss/take profit are provided
+            # If order is successful, submit stop loss/take profit orders concurrently
             if order and (stop_loss or take_profit):
+                protective_orders = []
                 if stop_loss:
                     sl_side = 'SELL' if side == 'BUY' else 'BUY'
-                    formatted_sl = self._format_number(stop_loss, precision_info['pricePrecision'])
-                    self._make_request('order', method='POST', params={
+                    formatted_sl = self._format_number(stop_loss, precision_info['price_format'])
+                    protective_orders.append(_REQUEST_EXECUTOR.submit(self._make_request, 'order', method='POST', params={
                         'symbol': symbol,
                         'side': sl_side,
                         'type': 'STOP_MARKET',
                         'stopPrice': formatted_sl,
                         'closePosition': 'true',
                         'timeInForce': 'GTC'
-                    }, signed=True)
+                    }, signed=True))
                 
                 if take_profit:
                     tp_side = 'SELL' if side == 'BUY' else 'BUY'
-                    formatted_tp = self._format_number(take_profit, precision_info['pricePrecision'])
-                    self._make_request('order', method='POST', params={
+                    formatted_tp = self._format_number(take_profit, precision_info['price_format'])
+                    protective_orders.append(_REQUEST_EXECUTOR.submit(self._make_request, 'order', method='POST', params={
                         'symbol': symbol,
                         'side': tp_side,
                         'type': 'TAKE_PROFIT_MARKET',
                         'stopPrice': formatted_tp,
                         'closePosition': 'true',
                         'timeInForce': 'GTC'
-                    }, signed=True)
+                    }, signed=True))
+                
+                for future in protective_orders:
+                    future.result()
             
             return order
         except Exception as e:
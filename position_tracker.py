@@ -1,10 +1,25 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime
 import json
 import os
+import sys
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib codec
+    orjson = None
 from src.analysis.trading_analyzer import TradingAnalyzer
 
+# Recommendation fields that repeat the same text across every analysis
+RECOMMENDATION_TEXT_FIELDS = ('type', 'reason', 'message', 'severity')
+
+def _position_exposure(entry_price, current_price, size, sign):
+    """Return unrealized PnL and its magnitude as a percent of entry notional"""
+    unrealized_pnl = sign * (current_price - entry_price) * size
+    risk_percent = abs(unrealized_pnl) / (size * entry_price) * 100
+    return unrealized_pnl, risk_percent
+
 class PositionTracker:
     def __init__(self, binance_client):
         self.binance_client = binance_client
@@ -21,20 +36,38 @@ class PositionTracker:
 
     def migrate_positions(self):
         """Migrate existing positions to new format"""
+        migrated = False
         for position in self.positions:
             # Add new fields if they don't exist
             if 'exit_price' not in position:
                 position['exit_price'] = None
+                migrated = True
             if 'exit_time' not in position:
                 position['exit_time'] = None
+                migrated = True
             if 'ai_recommendations' not in position:
                 position['ai_recommendations'] = []
-        self.save_positions()
+                migrated = True
+            self._intern_recommendations(position['ai_recommendations'])
+        # Only rewrite the file when a position actually changed
+        if migrated:
+            self.save_positions()
+
+    def _intern_recommendations(self, recommendations):
+        """Share one string object per distinct recommendation text"""
+        for recommendation in recommendations:
+            for action in recommendation.get('actions', []):
+                for field in RECOMMENDATION_TEXT_FIELDS:
+                    if isinstance(action.get(field), str):
+                        action[field] = sys.intern(action[field])
 
     def load_positions(self):
         """Load positions from file"""
         try:
             if os.path.exists(self.positions_file):
+                if orjson is not None:
+                    with open(self.positions_file, 'rb') as f:
+                        return orjson.loads(f.read())
                 with open(self.positions_file, 'r') as f:
                     return json.load(f)
             return []
@@ -45,11 +78,23 @@ class PositionTracker:
     def save_positions(self):
         """Save positions to file"""
         try:
+            if orjson is not None:
+                with open(self.positions_file, 'wb') as f:
+                    f.write(orjson.dumps(self.positions, option=orjson.OPT_SERIALIZE_NUMPY))
+                return
             with open(self.positions_file, 'w') as f:
                 json.dump(self.positions, f)
         except Exception as e:
             st.error(f"Error saving positions: {str(e)}")
 
+    def _positions_frame(self):
+        """Build a columnar view of positions with categorical string fields"""
+        df = pd.DataFrame(self.positions, columns=['symbol', 'direction', 'status', 'pnl'])
+        for column in ('symbol', 'direction', 'status'):
+            df[column] = df[column].astype('category')
+        df['pnl'] = df['pnl'].astype(float)
+        return df
+
     def analyze_position(self, position):
         """Perform AI analysis on a position"""
         try:
@@ -69,10 +114,10 @@ class PositionTracker:
             }
 
             # Analyze potential loss/profit scenarios
-            if direction == 'LONG':
-                unrealized_pnl = (current_price - entry_price) * float(position['size'])
-            else:
-                unrealized_pnl = (entry_price - current_price) * float(position['size'])
+            sign = 1.0 if direction == 'LONG' else -1.0
+            unrealized_pnl, risk_percent = _position_exposure(
+                entry_price, current_price, float(position['size']), sign
+            )
 
             # Dynamic SL/TP recommendations based on market conditions
             if analysis['trade_signals']['recommended_direction']:
@@ -114,7 +159,6 @@ class PositionTracker:
                             })
 
             # Risk management recommendations
-            risk_percent = abs(unrealized_pnl) / (float(position['size']) * entry_price) * 100
             if risk_percent > 2:  # If potential loss exceeds 2%
                 recommendations['actions'].append({
                     'type': 'RISK_WARNING',
@@ -140,53 +184,57 @@ class PositionTracker:
 
     def update_positions(self):
         """Update all positions with current market data and AI analysis"""
-        for position in self.positions:
-            if position['status'] == 'OPEN':
-                # Get current market data
-                market_data = self.binance_client.get_market_data(position['symbol'])
-                if market_data is not None:
-                    current_price = float(market_data['last_price'].iloc[-1])
-                    
-                    # Calculate PnL
-                    entry_price = float(position['entry_price'])
-                    size = float(position['size'])
-                    
-                    if position['direction'] == 'LONG':
-                        pnl = (current_price - entry_price) * size
-                    else:
-                        pnl = (entry_price - current_price) * size
-                    
-                    position['pnl'] = pnl
-                    position['last_update'] = datetime.now().isoformat()
-                    
-                    # Check if stop loss or take profit hit
-                    if position['direction'] == 'LONG':
-                        if current_price <= float(position['stop_loss']):
-                            position['status'] = 'CLOSED_SL'
-                            position['exit_price'] = float(position['stop_loss'])
-                            position['exit_time'] = datetime.now().isoformat()
-                        elif current_price >= float(position['take_profit']):
-                            position['status'] = 'CLOSED_TP'
-                            position['exit_price'] = float(position['take_profit'])
-                            position['exit_time'] = datetime.now().isoformat()
-                    else:
-                        if current_price >= float(position['stop_loss']):
-                            position['status'] = 'CLOSED_SL'
-                            position['exit_price'] = float(position['stop_loss'])
-                            position['exit_time'] = datetime.now().isoformat()
-                        elif current_price <= float(position['take_profit']):
-                            position['status'] = 'CLOSED_TP'
-                            position['exit_price'] = float(position['take_profit'])
-                            position['exit_time'] = datetime.now().isoformat()
-
-                    # Perform AI analysis if monitoring is active
-                    if self.ai_monitoring_active:
-                        recommendations = self.analyze_position(position)
-                        if recommendations:
-                            position['ai_recommendations'] = position.get('ai_recommendations', [])
-                            position['ai_recommendations'].append(recommendations)
+        # Get latest prices in a single request; a lone symbol uses the
+        # lighter single-symbol ticker instead of the all-symbols one
+        prices = {}
+        open_symbols = {p['symbol'] for p in self.positions if p['status'] == 'OPEN'}
+        if len(open_symbols) == 1:
+            symbol = next(iter(open_symbols))
+            last_price = self.binance_client.get_last_price(symbol)
+            if last_price is not None:
+                prices[symbol] = last_price
+        elif open_symbols:
+            prices = self.binance_client.get_all_prices()
+        open_positions = [p for p in self.positions
+                          if p['status'] == 'OPEN' and p['symbol'] in prices]
         
-        self.save_positions()
+        if open_positions:
+            # Stack open positions into columns; sign is +1 for LONG and -1 for SHORT
+            current_prices = np.array([prices[p['symbol']] for p in open_positions])
+            entry_prices = np.array([float(p['entry_price']) for p in open_positions])
+            sizes = np.array([float(p['size']) for p in open_positions])
+            stop_losses = np.array([float(p['stop_loss']) for p in open_positions])
+            take_profits = np.array([float(p['take_profit']) for p in open_positions])
+            signs = np.array([1.0 if p['direction'] == 'LONG' else -1.0 for p in open_positions])
+            
+            # Calculate PnL and stop loss / take profit hits for all positions at once
+            pnls = signs * (current_prices - entry_prices) * sizes
+            hit_sl = signs * (current_prices - stop_losses) <= 0
+            hit_tp = ~hit_sl & (signs * (current_prices - take_profits) >= 0)
+            
+            # One timestamp for the whole update tick
+            now = datetime.now().isoformat()
+            for i, position in enumerate(open_positions):
+                position['pnl'] = float(pnls[i])
+                position['last_update'] = now
+                
+                if hit_sl[i]:
+                    position['status'] = 'CLOSED_SL'
+                    position['exit_price'] = float(stop_losses[i])
+                    position['exit_time'] = now
+                elif hit_tp[i]:
+                    position['status'] = 'CLOSED_TP'
+                    position['exit_price'] = float(take_profits[i])
+                    position['exit_time'] = now
+
+                # Perform AI analysis if monitoring is active
+                if self.ai_monitoring_active:
+                    recommendations = self.analyze_position(position)
+                    if recommendations:
+                        position['ai_recommendations'] = position.get('ai_recommendations', [])
+                        position['ai_recommendations'].append(recommendations)
+            
+            self.save_positions()
 
     def display_ai_recommendations(self, position):
         """Display AI recommendations for a position"""
@@ -228,9 +276,10 @@ class PositionTracker:
         
         # Summary metrics
         if self.positions:
-            total_pnl = sum(float(p['pnl']) for p in self.positions)
-            open_positions = sum(1 for p in self.positions if p['status'] == 'OPEN')
-            closed_positions = sum(1 for p in self.positions if p['status'] != 'OPEN')
+            positions_df = self._positions_frame()
+            total_pnl = positions_df['pnl'].sum()
+            open_positions = int((positions_df['status'] == 'OPEN').sum())
+            closed_positions = len(positions_df) - open_positions
             
             col1, col2, col3 = st.columns(3)
             with col1:
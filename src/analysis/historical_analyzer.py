@@ -1,16 +1,69 @@
 import pandas as pd
 import numpy as np
+import copy
+from collections import OrderedDict
+from collections.abc import Sequence
+from functools import cached_property
 from typing import Dict, List, Tuple
 from datetime import datetime, timedelta
 
+class _RecordColumns:
+    """Prediction columns and the record dicts built from them on first access"""
+    
+    def __init__(self, columns: Dict[str, np.ndarray], build):
+        self.columns = columns
+        self._build = build  # Turns the columns into (predictions, detailed) records
+        
+    @cached_property
+    def records(self) -> Tuple[List[Dict], List[Dict]]:
+        return self._build(self.columns)
+
+class _LazyRecords(Sequence):
+    """Read-only list of record dicts that are only built when first accessed"""
+    
+    def __init__(self, source: _RecordColumns, position: int, length: int):
+        self._source = source  # Shared by the sibling record views
+        self._position = position
+        self._length = length
+        
+    def _records(self) -> List[Dict]:
+        return self._source.records[self._position]
+        
+    def __getitem__(self, index):
+        return self._records()[index]
+        
+    def __iter__(self):
+        return iter(self._records())
+        
+    def __len__(self) -> int:
+        return self._length
+        
+    def __eq__(self, other) -> bool:
+        return list(self) == list(other) if isinstance(other, (list, Sequence)) else NotImplemented
+        
+    def __repr__(self) -> str:
+        return repr(self._records())
+
 class HistoricalAnalyzer:
     # Constants
     MIN_DATA_POINTS = 50  # Minimum number of data points required for analysis
     MIN_PREDICTION_POINTS = 24  # Minimum points needed for prediction validation
+    TREND_POINTS = 50  # Points needed for a reliable SMA20/SMA50 trend
+    RESULTS_CACHE_SIZE = 32  # Number of recent analyses kept for repeated calls
+    REQUIRED_COLUMNS = ['high', 'low', 'close', 'volume']  # Columns the vectorized passes read
+    
+    # Trend codes stored in the int8 trend columns
+    TREND_UNKNOWN = -2
+    TREND_DOWN = -1
+    TREND_SIDEWAYS = 0
+    TREND_UP = 1
+    # Labels indexed by trend code - TREND_UNKNOWN
+    TREND_LABELS = np.array(['unknown', 'downtrend', 'sideways', 'uptrend'], dtype=object)
     
     def __init__(self):
         self.predictions = []
         self.actual_results = []
+        self._results_cache = OrderedDict()
         
     def analyze_historical_data(self, market_data: pd.DataFrame, 
                               analysis_results: Dict,
@@ -54,15 +107,33 @@ class HistoricalAnalyzer:
             if market_data is None or market_data.empty:
                 raise ValueError("No market data provided")
                 
-            if not isinstance(market_data.index, pd.DatetimeIndex):
-                market_data.index = pd.to_datetime(market_data.index)
-            
             # Ensure dates are pandas Timestamp objects
             start_ts = pd.Timestamp(start_date)
             end_ts = pd.Timestamp(end_date)
             
-            # Filter data for date range
-            period_data = market_data.loc[start_ts:end_ts].copy()
+            # Repeated calls on the same data and signal reuse the computed
+            # columns and metrics; records are rebuilt so callers never share them
+            cache_key = self._results_cache_key(market_data, analysis_results, start_ts, end_ts)
+            if cache_key in self._results_cache:
+                self._results_cache.move_to_end(cache_key)
+                columns, metrics = self._results_cache[cache_key]
+                results.update(copy.deepcopy(metrics))
+                results['predictions'], results['detailed_analysis'] = self._lazy_records(columns)
+                return results
+                
+            # Convert on a copy so the caller's frame is never modified
+            if market_data.index.dtype.kind != 'M':
+                market_data = market_data.set_axis(pd.to_datetime(market_data.index))
+            
+            # Filter data for date range; on a sorted index the bounds come
+            # from a binary search and iloc slices without label lookups
+            index = market_data.index
+            if index.is_monotonic_increasing:
+                lo = index.searchsorted(start_ts, side='left')
+                hi = index.searchsorted(end_ts, side='right')
+                period_data = market_data.iloc[lo:hi]
+            else:
+                period_data = market_data.loc[start_ts:end_ts]
             
             # Validate data points
             if len(period_data) < self.MIN_DATA_POINTS:
@@ -70,42 +141,63 @@ class HistoricalAnalyzer:
             
             # Clean data
             period_data = self._clean_market_data(period_data)
+            self._validate_inputs(period_data)
             
-            # Generate predictions for each point
-            valid_predictions = 0
-            for i in range(len(period_data)):
-                # Ensure we have enough future data for validation
-                if i + self.MIN_PREDICTION_POINTS > len(period_data):
-                    break
-                    
-                historical_slice = period_data.iloc[:i]
-                if len(historical_slice) < self.MIN_DATA_POINTS:
-                    continue
-                    
-                # Generate prediction
-                prediction = self._generate_prediction(historical_slice, analysis_results)
-                
-                # Get actual outcome
-                actual = self._get_actual_outcome(period_data, i)
-                
-                if prediction and actual:
-                    results['predictions'].append({
-                        'timestamp': period_data.index[i],
-                        'predicted': prediction,
-                        'actual': actual,
-                        'success': self._evaluate_prediction(prediction, actual)
-                    })
-                    valid_predictions += 1
+            # Predictions are made at every index with enough history
+            # behind it and a full validation window ahead of it
+            n = len(period_data)
+            start = self.MIN_DATA_POINTS
+            stop = n - self.MIN_PREDICTION_POINTS + 1
+            count = stop - start
+            
+            # The trade signal does not change across the window, so price
+            # levels for every point come from one vectorized pass over close
+            trade_signals = analysis_results.get('trade_signals', {})
+            is_long = trade_signals.get('direction') == 'long'
+            confidence = float(trade_signals.get('confidence', 0))
+            tp_mult = 1.02 if is_long else 0.98
+            sl_mult = 0.99 if is_long else 1.01
+            
+            entry = period_data['close'].to_numpy(dtype=np.float64)
+            tp = entry * tp_mult
+            sl = entry * sl_mult
             
-            if valid_predictions < 1:
-                raise ValueError(f"No valid predictions could be generated. Need at least {self.MIN_PREDICTION_POINTS} future data points for validation.")
+            # Trend of the history ending at every index, and outcome over
+            # the validation window starting at every index
+            trend = self._calculate_trend(period_data['close'])
+            conditions = self._analyze_market_conditions(period_data, trend)
+            outcomes = self._get_actual_outcomes(period_data, trend)
+            
+            # Prediction columns; the prediction at i only sees history before i
+            current = slice(start, stop)
+            history = slice(start - 1, stop - 1)
+            columns = {
+                'timestamp': period_data.index[current],
+                'is_long': np.full(count, is_long),
+                'confidence': np.full(count, confidence),
+                'entry': entry[history],
+                'tp': tp[history],
+                'sl': sl[history],
+                'volatility': conditions['volatility'][history],
+                'trend': conditions['trend'][history],
+                'volume_high': conditions['volume_high'][history],
+                'actual_high': outcomes['high'][current],
+                'actual_low': outcomes['low'][current],
+                'actual_close': outcomes['close'][current],
+                'actual_trend': outcomes['trend'][current]
+            }
+            columns['success'] = self._evaluate_predictions(columns)
             
             # Calculate metrics
-            if results['predictions']:
-                results['accuracy_metrics'] = self._calculate_accuracy_metrics(results['predictions'])
-                results['roi_metrics'] = self._calculate_roi_metrics(results['predictions'])
-                results['detailed_analysis'] = self._generate_detailed_analysis(results)
-                results['error_analysis'] = self._analyze_errors(results['predictions'])
+            results['predictions'], results['detailed_analysis'] = self._lazy_records(columns)
+            results['accuracy_metrics'] = self._calculate_accuracy_metrics(columns)
+            results['roi_metrics'] = self._calculate_roi_metrics(columns)
+            results['error_analysis'] = self._analyze_errors(columns)
+            
+            metrics = {key: results[key] for key in ('accuracy_metrics', 'roi_metrics', 'error_analysis')}
+            self._results_cache[cache_key] = (columns, copy.deepcopy(metrics))
+            if len(self._results_cache) > self.RESULTS_CACHE_SIZE:
+                self._results_cache.popitem(last=False)
             
             return results
             
@@ -113,293 +205,270 @@ class HistoricalAnalyzer:
             print(f"Error in historical analysis: {str(e)}")
             return results
 
-    def _clean_market_data(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Clean and validate market data"""
-        try:
-            # Convert price columns to numeric
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                if col in data.columns:
-                    data[col] = pd.to_numeric(data[col], errors='coerce')
-            
-            # Handle missing values
-            data = data.fillna(method='ffill').fillna(method='bfill')
-            
-            # Remove any remaining invalid data
-            data = data.replace([np.inf, -np.inf], np.nan).dropna()
-            
-            return data
-        except Exception as e:
-            print(f"Error cleaning market data: {str(e)}")
-            return data
-            
-    def _generate_prediction(self, data: pd.DataFrame, analysis_results: Dict) -> Dict:
-        """Generate a prediction for a specific point in time"""
-        try:
-            if len(data) < self.MIN_DATA_POINTS:
-                return None
-                
-            # Apply current AI analysis logic to historical data point
-            prediction = {
-                'direction': 'long' if analysis_results.get('trade_signals', {}).get('direction') == 'long' else 'short',
-                'confidence': float(analysis_results.get('trade_signals', {}).get('confidence', 0)),
+    def _results_cache_key(self, market_data: pd.DataFrame, analysis_results: Dict,
+                           start_ts: pd.Timestamp, end_ts: pd.Timestamp) -> Tuple:
+        """
+        Key identifying an analysis: a hash of the index and the columns the
+        analysis reads (so any appended or edited row misses, and equal data
+        in a new frame hits), the date range and the only signal fields the
+        analysis reads.
+        """
+        # Missing columns are left out here and reported by validation
+        content = market_data.filter(items=self.REQUIRED_COLUMNS)
+        row_hashes = pd.util.hash_pandas_object(content, index=True).to_numpy()
+        trade_signals = analysis_results.get('trade_signals', {})
+        return (
+            len(market_data),
+            hash(row_hashes.tobytes()),
+            start_ts,
+            end_ts,
+            trade_signals.get('direction') == 'long',
+            float(trade_signals.get('confidence', 0))
+        )
+
+    def _lazy_records(self, columns: Dict[str, np.ndarray]) -> Tuple[_LazyRecords, _LazyRecords]:
+        """
+        Prediction and detailed analysis record views over the columns. The
+        dicts are built in one pass the first time either view is read, so
+        callers that only use the metrics never pay for them.
+        """
+        source = _RecordColumns(columns, self._columns_to_records)
+        length = len(columns['success'])
+        return _LazyRecords(source, 0, length), _LazyRecords(source, 1, length)
+
+    @classmethod
+    def _columns_to_records(cls, columns: Dict[str, np.ndarray]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Expand prediction columns into the per-prediction records and the
+        detailed analysis records shown in the UI, in a single pass. Both
+        records share the same nested prediction/outcome dicts.
+        """
+        # Coded columns go back to their string labels only here
+        labels = dict(columns)
+        labels['direction'] = np.where(columns['is_long'], 'long', 'short').astype(object)
+        labels['trend'] = cls.TREND_LABELS[columns['trend'] - cls.TREND_UNKNOWN]
+        labels['actual_trend'] = cls.TREND_LABELS[columns['actual_trend'] - cls.TREND_UNKNOWN]
+        labels['volume_profile'] = np.where(columns['volume_high'], 'high', 'low').astype(object)
+        
+        # tolist() converts each column to native Python values in one C
+        # pass, so no per-element indexing or casting is needed below
+        rows = zip(*(labels[key].tolist() for key in (
+            'timestamp', 'direction', 'confidence', 'entry', 'tp', 'sl',
+            'volatility', 'trend', 'volume_profile',
+            'actual_high', 'actual_low', 'actual_close', 'actual_trend', 'success'
+        )))
+        
+        predictions = []
+        detailed = []
+        for (timestamp, direction, confidence, entry, tp, sl,
+             volatility, trend, volume_profile,
+             actual_high, actual_low, actual_close, actual_trend, success) in rows:
+            market_conditions = {
+                'volatility': volatility,
+                'trend': trend,
+                'volume_profile': volume_profile
+            }
+            predicted = {
+                'direction': direction,
+                'confidence': confidence,
                 'price_levels': {
-                    'entry': float(data['close'].iloc[-1]),
-                    'tp': float(data['close'].iloc[-1]) * (1.02 if analysis_results.get('trade_signals', {}).get('direction') == 'long' else 0.98),
-                    'sl': float(data['close'].iloc[-1]) * (0.99 if analysis_results.get('trade_signals', {}).get('direction') == 'long' else 1.01)
+                    'entry': entry,
+                    'tp': tp,
+                    'sl': sl
                 },
-                'market_conditions': self._analyze_market_conditions(data)
+                'market_conditions': market_conditions
             }
-            return prediction
-        except Exception as e:
-            print(f"Error generating prediction: {str(e)}")
-            return None
-            
-    def _get_actual_outcome(self, data: pd.DataFrame, index: int) -> Dict:
-        """Get the actual market outcome after a prediction"""
-        try:
-            future_data = data.iloc[index:index + self.MIN_PREDICTION_POINTS]
-            if len(future_data) < self.MIN_PREDICTION_POINTS:
-                return None
-                
-            return {
-                'high': float(future_data['high'].max()),
-                'low': float(future_data['low'].min()),
-                'close': float(future_data['close'].iloc[-1]),
-                'trend': self._calculate_trend(future_data)
+            actual = {
+                'high': actual_high,
+                'low': actual_low,
+                'close': actual_close,
+                'trend': actual_trend
             }
-        except Exception as e:
-            print(f"Error getting actual outcome: {str(e)}")
-            return None
             
-    def _evaluate_prediction(self, prediction: Dict, actual: Dict) -> bool:
-        """Evaluate if a prediction was successful"""
-        try:
-            if prediction['direction'] == 'long':
-                return float(actual['high']) >= float(prediction['price_levels']['tp']) and \
-                       float(actual['low']) >= float(prediction['price_levels']['sl'])
-            else:
-                return float(actual['low']) <= float(prediction['price_levels']['tp']) and \
-                       float(actual['high']) <= float(prediction['price_levels']['sl'])
-        except Exception as e:
-            print(f"Error evaluating prediction: {str(e)}")
-            return False
+            predictions.append({
+                'timestamp': timestamp,
+                'predicted': predicted,
+                'actual': actual,
+                'success': success
+            })
+            detailed.append({
+                'timestamp': timestamp,
+                'prediction': predicted,
+                'outcome': actual,
+                'success': success,
+                'confidence': confidence,
+                'market_conditions': market_conditions
+            })
+        return predictions, detailed
+
+    def _clean_market_data(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Clean and validate market data"""
+        # Convert price columns to numeric; assign() returns a new frame,
+        # so the caller's data is never modified
+        data = data.assign(**{
+            col: pd.to_numeric(data[col], errors='coerce')
+            for col in ['open', 'high', 'low', 'close', 'volume']
+            if col in data.columns
+        })
+        
+        # Handle missing values
+        data = data.ffill().bfill()
+        
+        # Remove any remaining invalid data with a single row mask
+        valid = data.notna().all(axis=1)
+        numeric_columns = data.select_dtypes(include=[np.number]).columns
+        valid &= np.isfinite(data[numeric_columns]).all(axis=1)
+        
+        return data[valid]
             
-    def _calculate_accuracy_metrics(self, predictions: List[Dict]) -> Dict:
-        """Calculate accuracy metrics for predictions"""
-        try:
-            if not predictions:
-                return {
-                    'overall_accuracy': 0,
-                    'long_accuracy': 0,
-                    'short_accuracy': 0,
-                    'high_confidence_accuracy': 0,
-                    'low_confidence_accuracy': 0
-                }
-                
-            successful = len([p for p in predictions if p['success']])
-            long_predictions = [p for p in predictions if p['predicted']['direction'] == 'long']
-            short_predictions = [p for p in predictions if p['predicted']['direction'] == 'short']
+    def _validate_inputs(self, period_data: pd.DataFrame):
+        """
+        Check everything the vectorized passes rely on up front, so they can
+        run without per-step error handling. Raises ValueError on bad input.
+        """
+        missing = [col for col in self.REQUIRED_COLUMNS if col not in period_data.columns]
+        if missing:
+            raise ValueError(f"Market data is missing required columns: {', '.join(missing)}")
+        
+        if len(period_data) < self.MIN_DATA_POINTS + self.MIN_PREDICTION_POINTS:
+            raise ValueError(f"No valid predictions could be generated. Need at least {self.MIN_PREDICTION_POINTS} future data points for validation.")
+        
+        if period_data[self.REQUIRED_COLUMNS].isna().to_numpy().any():
+            raise ValueError("Market data contains missing values after cleaning")
             
-            successful_long = len([p for p in long_predictions if p['success']])
-            successful_short = len([p for p in short_predictions if p['success']])
+    def _get_actual_outcomes(self, data: pd.DataFrame, trend: np.ndarray) -> Dict[str, np.ndarray]:
+        """Get the actual market outcome over the window starting at each index"""
+        window = self.MIN_PREDICTION_POINTS
+        close = data['close'].to_numpy(dtype=np.float64)
+        
+        # A window only has its own trend once it spans TREND_POINTS, and
+        # then it matches the trend of the full history at its last point
+        if window >= self.TREND_POINTS:
+            window_trend = trend[window - 1:]
+        else:
+            window_trend = np.full(len(close) - window + 1, self.TREND_UNKNOWN, dtype=np.int8)
+        
+        # The window starting at k is the rolling window ending at
+        # k + window - 1; rolling extremes run in a single linear pass
+        return {
+            'high': data['high'].rolling(window).max().to_numpy(dtype=np.float64)[window - 1:],
+            'low': data['low'].rolling(window).min().to_numpy(dtype=np.float64)[window - 1:],
+            'close': close[window - 1:],
+            'trend': window_trend
+        }
+            
+    def _evaluate_predictions(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """Evaluate which predictions were successful"""
+        # Long: TP reached without breaching SL; short: the mirror image
+        success_long = (columns['actual_high'] >= columns['tp']) & (columns['actual_low'] >= columns['sl'])
+        success_short = (columns['actual_low'] <= columns['tp']) & (columns['actual_high'] <= columns['sl'])
+        return np.where(columns['is_long'], success_long, success_short)
             
+    def _calculate_accuracy_metrics(self, columns: Dict[str, np.ndarray]) -> Dict:
+        """Calculate accuracy metrics for predictions"""
+        success = columns['success']
+        return {
+            'overall_accuracy': self._group_accuracy(success, np.ones(len(success), dtype=bool)),
+            'long_accuracy': self._group_accuracy(success, columns['is_long']),
+            'short_accuracy': self._group_accuracy(success, ~columns['is_long']),
             # Analyze confidence levels
-            high_confidence = [p for p in predictions if p['predicted']['confidence'] >= 75]
-            low_confidence = [p for p in predictions if p['predicted']['confidence'] < 75]
+            'high_confidence_accuracy': self._group_accuracy(success, columns['confidence'] >= 75),
+            'low_confidence_accuracy': self._group_accuracy(success, columns['confidence'] < 75)
+        }
             
-            successful_high_conf = len([p for p in high_confidence if p['success']])
-            successful_low_conf = len([p for p in low_confidence if p['success']])
+    def _group_accuracy(self, success: np.ndarray, group: np.ndarray) -> float:
+        """Percentage of successful predictions within a boolean group mask"""
+        total = group.sum()
+        return float((success & group).sum() / total) * 100 if total else 0
             
-            return {
-                'overall_accuracy': (successful / len(predictions)) * 100 if predictions else 0,
-                'long_accuracy': (successful_long / len(long_predictions)) * 100 if long_predictions else 0,
-                'short_accuracy': (successful_short / len(short_predictions)) * 100 if short_predictions else 0,
-                'high_confidence_accuracy': (successful_high_conf / len(high_confidence)) * 100 if high_confidence else 0,
-                'low_confidence_accuracy': (successful_low_conf / len(low_confidence)) * 100 if low_confidence else 0
-            }
-        except Exception as e:
-            print(f"Error calculating accuracy metrics: {str(e)}")
-            return {
-                'overall_accuracy': 0,
-                'long_accuracy': 0,
-                'short_accuracy': 0,
-                'high_confidence_accuracy': 0,
-                'low_confidence_accuracy': 0
-            }
-            
-    def _calculate_roi_metrics(self, predictions: List[Dict]) -> Dict:
+    def _calculate_roi_metrics(self, columns: Dict[str, np.ndarray]) -> Dict:
         """Calculate ROI metrics for predictions"""
-        try:
-            if not predictions:
-                return {
-                    'total_roi': 0,
-                    'avg_win': 0,
-                    'avg_loss': 0,
-                    'profit_factor': 0
-                }
+        success = columns['success']
+        entry = columns['entry']
+        tp = columns['tp']
+        sl = columns['sl']
+        
+        # Wins close at TP, losses at SL
+        wins = ((tp[success] - entry[success]) / entry[success]) * 100
+        losses = ((sl[~success] - entry[~success]) / entry[~success]) * 100
                 
-            wins = []
-            losses = []
-            
-            for pred in predictions:
-                if pred['success']:
-                    roi = ((pred['predicted']['price_levels']['tp'] - pred['predicted']['price_levels']['entry']) / 
-                           pred['predicted']['price_levels']['entry']) * 100
-                    wins.append(roi)
-                else:
-                    roi = ((pred['predicted']['price_levels']['sl'] - pred['predicted']['price_levels']['entry']) / 
-                           pred['predicted']['price_levels']['entry']) * 100
-                    losses.append(roi)
-                    
-            total_wins = sum(wins) if wins else 0
-            total_losses = abs(sum(losses)) if losses else 0
-            profit_factor = total_wins / total_losses if total_losses > 0 else 0
-                    
-            return {
-                'total_roi': total_wins + (total_losses * -1),
-                'avg_win': np.mean(wins) if wins else 0,
-                'avg_loss': np.mean(losses) if losses else 0,
-                'profit_factor': profit_factor
-            }
-        except Exception as e:
-            print(f"Error calculating ROI metrics: {str(e)}")
-            return {
-                'total_roi': 0,
-                'avg_win': 0,
-                'avg_loss': 0,
-                'profit_factor': 0
-            }
-            
-    def _analyze_market_conditions(self, data: pd.DataFrame) -> Dict:
-        """Analyze market conditions"""
-        try:
-            if len(data) < 2:
-                return {
-                    'volatility': 0,
-                    'trend': 'unknown',
-                    'volume_profile': 'normal'
-                }
+        total_wins = wins.sum() if wins.size else 0
+        total_losses = abs(losses.sum()) if losses.size else 0
+        profit_factor = total_wins / total_losses if total_losses > 0 else 0
                 
-            returns = data['close'].pct_change()
-            volatility = returns.std() * np.sqrt(252)  # Annualized volatility
-            
-            return {
-                'volatility': volatility,
-                'trend': self._calculate_trend(data),
-                'volume_profile': 'high' if data['volume'].iloc[-1] > data['volume'].mean() else 'low'
-            }
-        except Exception as e:
-            print(f"Error analyzing market conditions: {str(e)}")
-            return {
-                'volatility': 0,
-                'trend': 'unknown',
-                'volume_profile': 'normal'
-            }
+        return {
+            'total_roi': total_wins + (total_losses * -1),
+            'avg_win': wins.mean() if wins.size else 0,
+            'avg_loss': losses.mean() if losses.size else 0,
+            'profit_factor': profit_factor
+        }
             
-    def _calculate_trend(self, data: pd.DataFrame) -> str:
-        """Calculate market trend"""
-        try:
-            if len(data) < 50:  # Need enough data for reliable trend calculation
-                return 'unknown'
-                
-            sma20 = data['close'].rolling(window=20).mean()
-            sma50 = data['close'].rolling(window=50).mean()
+    def _analyze_market_conditions(self, data: pd.DataFrame, trend: np.ndarray) -> Dict[str, np.ndarray]:
+        """Analyze market conditions of the history ending at each point"""
+        # Annualized volatility of all returns up to each point
+        returns = data['close'].pct_change()
+        volatility = returns.expanding().std().to_numpy() * np.sqrt(252)
+        
+        # Volume above the running mean of all volume up to each point
+        volume = data['volume'].to_numpy(dtype=np.float64)
+        cumulative_mean = np.cumsum(volume) / np.arange(1, len(volume) + 1)
+        
+        return {
+            'volatility': volatility,
+            'trend': trend,
+            'volume_high': volume > cumulative_mean
+        }
             
-            if sma20.iloc[-1] > sma50.iloc[-1]:
-                return 'uptrend'
-            elif sma20.iloc[-1] < sma50.iloc[-1]:
-                return 'downtrend'
-            else:
-                return 'sideways'
-        except Exception as e:
-            print(f"Error calculating trend: {str(e)}")
-            return 'unknown'
+    def _calculate_trend(self, close: pd.Series) -> np.ndarray:
+        """Calculate market trend of the history ending at each point"""
+        sma20 = close.rolling(window=20).mean().to_numpy()
+        sma50 = close.rolling(window=50).mean().to_numpy()
+        
+        trend = np.where(sma20 > sma50, self.TREND_UP,
+                         np.where(sma20 < sma50, self.TREND_DOWN, self.TREND_SIDEWAYS)).astype(np.int8)
+        # Need enough data for reliable trend calculation
+        trend[:self.TREND_POINTS - 1] = self.TREND_UNKNOWN
+        return trend
             
-    def _analyze_errors(self, predictions: List[Dict]) -> Dict:
+    def _analyze_errors(self, columns: Dict[str, np.ndarray]) -> Dict:
         """Analyze prediction errors to identify patterns"""
-        try:
-            if not predictions:
-                return {
-                    'high_volatility_fails': 0,
-                    'trend_misalignment': 0,
-                    'false_breakouts': 0,
-                    'stop_loss_hits': 0
-                }
-
-            failed_predictions = [p for p in predictions if not p['success']]
-            total_fails = len(failed_predictions)
-            
-            if total_fails == 0:
-                return {
-                    'high_volatility_fails': 0,
-                    'trend_misalignment': 0,
-                    'false_breakouts': 0,
-                    'stop_loss_hits': 0
-                }
-            
-            error_patterns = {
-                'high_volatility_fails': 0,
-                'trend_misalignment': 0,
-                'false_breakouts': 0,
-                'stop_loss_hits': 0
-            }
-            
-            for pred in failed_predictions:
-                # Check volatility related failures
-                if pred['predicted']['market_conditions']['volatility'] > 0.5:  # High volatility threshold
-                    error_patterns['high_volatility_fails'] += 1
-                    
-                # Check trend misalignment
-                if pred['predicted']['direction'] == 'long' and pred['actual']['trend'] == 'downtrend':
-                    error_patterns['trend_misalignment'] += 1
-                elif pred['predicted']['direction'] == 'short' and pred['actual']['trend'] == 'uptrend':
-                    error_patterns['trend_misalignment'] += 1
-                    
-                # Check false breakouts
-                if abs(pred['actual']['close'] - pred['predicted']['price_levels']['entry']) < \
-                   abs(pred['predicted']['price_levels']['tp'] - pred['predicted']['price_levels']['entry']) * 0.1:
-                    error_patterns['false_breakouts'] += 1
-                    
-                # Check stop loss hits
-                if pred['predicted']['direction'] == 'long' and \
-                   pred['actual']['low'] <= pred['predicted']['price_levels']['sl']:
-                    error_patterns['stop_loss_hits'] += 1
-                elif pred['predicted']['direction'] == 'short' and \
-                     pred['actual']['high'] >= pred['predicted']['price_levels']['sl']:
-                    error_patterns['stop_loss_hits'] += 1
-                    
-            # Calculate percentages
-            for key in error_patterns:
-                error_patterns[key] = (error_patterns[key] / total_fails) * 100
-                    
-            return error_patterns
-        except Exception as e:
-            print(f"Error analyzing errors: {str(e)}")
+        failed = ~columns['success']
+        total_fails = int(failed.sum())
+        
+        if total_fails == 0:
             return {
                 'high_volatility_fails': 0,
                 'trend_misalignment': 0,
                 'false_breakouts': 0,
                 'stop_loss_hits': 0
             }
-
-    def _generate_detailed_analysis(self, results: Dict) -> List[Dict]:
-        """Generate detailed analysis of predictions"""
-        try:
-            if not results.get('predictions'):
-                return []
-
-            detailed = []
-            for pred in results['predictions']:
-                analysis = {
-                    'timestamp': pred['timestamp'],
-                    'prediction': pred['predicted'],
-                    'outcome': pred['actual'],
-                    'success': pred['success'],
-                    'confidence': pred['predicted']['confidence'],
-                    'market_conditions': pred['predicted']['market_conditions']
-                }
-                detailed.append(analysis)
-            return detailed
-        except Exception as e:
-            print(f"Error generating detailed analysis: {str(e)}")
-            return []
+        
+        volatility = columns['volatility']
+        entry = columns['entry']
+        tp = columns['tp']
+        sl = columns['sl']
+        actual_trend = columns['actual_trend']
+        actual_high = columns['actual_high']
+        actual_low = columns['actual_low']
+        actual_close = columns['actual_close']
+        is_long = columns['is_long']
+        is_short = ~is_long
+        
+        error_patterns = {
+            # Volatility related failures
+            'high_volatility_fails': (failed & (volatility > 0.5)).sum(),  # High volatility threshold
+            # Trend misalignment
+            'trend_misalignment': (failed & ((is_long & (actual_trend == self.TREND_DOWN)) |
+                                             (is_short & (actual_trend == self.TREND_UP)))).sum(),
+            # False breakouts
+            'false_breakouts': (failed & (np.abs(actual_close - entry) < np.abs(tp - entry) * 0.1)).sum(),
+            # Stop loss hits
+            'stop_loss_hits': (failed & ((is_long & (actual_low <= sl)) |
+                                         (is_short & (actual_high >= sl)))).sum()
+        }
+                
+        # Calculate percentages
+        for key in error_patterns:
+            error_patterns[key] = (error_patterns[key] / total_fails) * 100
+                
+        return error_patterns
@@ -2,6 +2,43 @@ import pandas as pd
 import numpy as np
 from typing import Union, List, Dict, Optional
 
+TOUCH_MASK_SIZE = 1_000_000  # Max elements in one support/resistance touch mask
+
+def _distribute_volume(lows: np.ndarray, highs: np.ndarray, volumes: np.ndarray,
+                       levels: np.ndarray, price_delta: float) -> np.ndarray:
+    """
+    Spread each bar's volume over the sorted price levels inside its
+    [low, high] range and return the volume at every level
+    """
+    # Handle cases where high equals low
+    highs = np.where(highs == lows, lows * 1.00001, highs)
+    
+    # Each bar adds the same share of its volume to every level within
+    # [low, high]; those levels are a contiguous index range
+    with np.errstate(divide='ignore', invalid='ignore'):
+        shares = volumes / ((highs - lows) / price_delta)
+    first = np.searchsorted(levels, lows, side='left')
+    counts = np.searchsorted(levels, highs, side='right') - first
+    counts = np.where(np.isnan(lows) | np.isnan(highs), 0, np.maximum(counts, 0))
+    
+    # Expand to one (bar, level) pair per touched level, in bar order, so
+    # every level sums its shares in the same order as a per-bar loop
+    bar_ids = np.repeat(np.arange(len(lows)), counts)
+    offsets = np.arange(len(bar_ids)) - np.repeat(np.cumsum(counts) - counts, counts)
+    level_ids = first[bar_ids] + offsets
+    
+    return np.bincount(level_ids, weights=shares[bar_ids], minlength=len(levels))
+
+def _count_touches(values: np.ndarray, prices: np.ndarray, tolerance: float) -> np.ndarray:
+    """Count the values within tolerance (a fraction of the price) of each price"""
+    counts = np.empty(len(prices), dtype=np.int64)
+    # Broadcast a block of prices at a time to bound the (prices x values) mask
+    step = max(1, TOUCH_MASK_SIZE // max(len(values), 1))
+    for start in range(0, len(prices), step):
+        block = prices[start:start + step, None]
+        counts[start:start + step] = (np.abs(values[None, :] - block) <= block * tolerance).sum(axis=1)
+    return counts
+
 class TechnicalIndicators:
     @staticmethod
     def calculate_ema(data: pd.Series, periods: Union[int, List[int]] = 20) -> Dict[str, pd.Series]:
@@ -16,10 +53,15 @@ class TechnicalIndicators:
         if isinstance(periods, int):
             periods = [periods]
         
-        emas = {}
-        for period in periods:
-            emas[f'EMA_{period}'] = data.ewm(span=period, adjust=False).mean()
-        return emas
+        # Convert once so each EMA pass runs straight on a float64 array
+        if data.dtype != np.float64:
+            data = data.astype(np.float64)
+        
+        # One compiled recurrence pass per distinct period
+        return {
+            f'EMA_{period}': data.ewm(span=period, adjust=False).mean()
+            for period in dict.fromkeys(periods)
+        }
 
     @staticmethod
     def calculate_advanced_rsi(data: pd.Series, period: int = 14, 
@@ -36,12 +78,22 @@ class TechnicalIndicators:
         """
         try:
             # Ensure data is clean and finite
-            data = pd.to_numeric(data, errors='coerce')
-            data = data.replace([np.inf, -np.inf], np.nan)
-            data = data.fillna(method='ffill')  # Forward fill any remaining NaN values
+            values = pd.to_numeric(data, errors='coerce').to_numpy(dtype=np.float64, copy=True)
+            values[~np.isfinite(values)] = np.nan
+            missing = np.isnan(values)
+            
+            if missing.any():
+                # Forward fill any NaN values from the last valid position
+                last_valid = np.where(missing, 0, np.arange(len(values)))
+                np.maximum.accumulate(last_valid, out=last_valid)
+                values = values[last_valid]
+                
+                # Fill any remaining leading NaNs with mean
+                leading = np.isnan(values)
+                if leading.any():
+                    values[leading] = np.nanmean(values)
             
-            if data.isna().any():
-                data = data.fillna(data.mean())  # Fill any remaining NaNs with mean
+            data = pd.Series(values, index=data.index, name=data.name)
             
             # Calculate price changes
             delta = data.diff()
@@ -50,48 +102,36 @@ class TechnicalIndicators:
             gain = delta.clip(lower=0).fillna(0)
             loss = (-delta.clip(upper=0)).fillna(0)
             
-            # Calculate average gain and loss
-            avg_gain = gain.rolling(window=period, min_periods=1).mean()
-            avg_loss = loss.rolling(window=period, min_periods=1).mean()
-            
-            # Ensure no zero division
-            avg_loss = avg_loss.replace(0, 0.00001)
-            
-            # Calculate RS and RSI
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
+            # Calculate average gain and loss with Wilder's smoothing
+            avg_gain = gain.ewm(alpha=1.0 / period, adjust=False, min_periods=period).mean()
+            avg_loss = loss.ewm(alpha=1.0 / period, adjust=False, min_periods=period).mean()
             
-            # Clean up any remaining invalid values
-            rsi = rsi.clip(0, 100)
-            rsi = rsi.fillna(50)  # Fill any remaining NaNs with neutral RSI
+            # Calculate RSI as 100 * gain / (gain + loss), the same value as
+            # 100 - 100 / (1 + RS) but bounded to [0, 100] by construction;
+            # with no movement at all (or invalid values) it is neutral
+            total = (avg_gain + avg_loss).to_numpy()
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rsi_values = np.where(total > 0, 100.0 * avg_gain.to_numpy() / total, 50.0)
+            rsi = pd.Series(rsi_values, index=data.index)
             
             # Generate signals
-            signals = pd.Series(0, index=data.index)
-            signals.loc[rsi < oversold] = 1  # Oversold (potential buy)
-            signals.loc[rsi > overbought] = -1  # Overbought (potential sell)
+            # 1 when oversold (potential buy), -1 when overbought (potential sell)
+            signals = pd.Series(
+                (rsi_values < oversold).astype(np.int8) - (rsi_values > overbought).astype(np.int8),
+                index=data.index
+            )
+            
+            # Calculate RSI divergence: compare each value with the extreme of
+            # the period - 1 values before it
+            prior = period - 1
             
-            # Calculate RSI divergence
-            def check_higher_high(x):
-                if len(x) < 2:
-                    return False
-                current = x.iloc[-1]
-                previous = x.iloc[:-1].max()
-                return current > previous
-
-            def check_lower_low(x):
-                if len(x) < 2:
-                    return False
-                current = x.iloc[-1]
-                previous = x.iloc[:-1].min()
-                return current < previous
-
             # Calculate price and RSI trends
-            price_higher_highs = data.rolling(window=period).apply(check_higher_high).astype(int)
-            rsi_lower_highs = rsi.rolling(window=period).apply(lambda x: 1 if len(x) > 1 and x.iloc[-1] < x.iloc[:-1].max() else 0)
+            price_higher_highs = (data > data.shift(1).rolling(window=prior).max()).astype(int)
+            rsi_lower_highs = (rsi < rsi.shift(1).rolling(window=prior).max()).astype(int)
             bearish_divergence = (price_higher_highs.astype(bool) & rsi_lower_highs.astype(bool)).astype(int)
             
-            price_lower_lows = data.rolling(window=period).apply(check_lower_low).astype(int)
-            rsi_higher_lows = rsi.rolling(window=period).apply(lambda x: 1 if len(x) > 1 and x.iloc[-1] > x.iloc[:-1].min() else 0)
+            price_lower_lows = (data < data.shift(1).rolling(window=prior).min()).astype(int)
+            rsi_higher_lows = (rsi > rsi.shift(1).rolling(window=prior).min()).astype(int)
             bullish_divergence = (price_lower_lows.astype(bool) & rsi_higher_lows.astype(bool)).astype(int)
             
             return {
@@ -124,62 +164,35 @@ class TechnicalIndicators:
             Dictionary containing support and resistance levels
         """
         try:
-            def is_support(df: pd.DataFrame, i: int) -> bool:
-                if i - window < 0 or i + window >= len(df):
-                    return False
-                
-                current_low = df['low'].iloc[i]
-                for j in range(i-window, i+window):
-                    if df['low'].iloc[j] < current_low:
-                        return False
-                return True
+            lows = data['low']
+            highs = data['high']
+            low_values = lows.to_numpy()
+            high_values = highs.to_numpy()
             
-            def is_resistance(df: pd.DataFrame, i: int) -> bool:
-                if i - window < 0 or i + window >= len(df):
-                    return False
-                
-                current_high = df['high'].iloc[i]
-                for j in range(i-window, i+window):
-                    if df['high'].iloc[j] > current_high:
-                        return False
-                return True
+            # A pivot at i must be the extreme of [i - window, i + window),
+            # which is the rolling window of length 2 * window ending at
+            # i + window - 1; shift it back so it lines up with i
+            span = 2 * window
+            window_low = lows.rolling(span, min_periods=1).min().shift(-(window - 1)).to_numpy()
+            window_high = highs.rolling(span, min_periods=1).max().shift(-(window - 1)).to_numpy()
             
-            levels = []
+            # Only points with a full window on both sides qualify
+            positions = np.arange(len(data))
+            in_range = (positions >= window) & (positions < len(data) - window)
+            is_support = in_range & (low_values == window_low)
+            is_resistance = in_range & ~is_support & (high_values == window_high)
             
             # Find potential levels
-            for i in range(window, len(data) - window):
-                if is_support(data, i):
-                    levels.append((i, data['low'].iloc[i], 'support'))
-                elif is_resistance(data, i):
-                    levels.append((i, data['high'].iloc[i], 'resistance'))
+            support_prices = low_values[is_support]
+            resistance_prices = high_values[is_resistance]
             
-            # Count touches for each level
-            support_levels = []
-            resistance_levels = []
-            
-            for level in levels:
-                touches = 0
-                level_price = level[1]
-                level_type = level[2]
-                
-                # Count price touches around this level
-                for i in range(len(data)):
-                    if level_type == 'support':
-                        if abs(data['low'].iloc[i] - level_price) <= (level_price * 0.002):  # 0.2% tolerance
-                            touches += 1
-                    else:
-                        if abs(data['high'].iloc[i] - level_price) <= (level_price * 0.002):
-                            touches += 1
-                
-                if touches >= num_touches:
-                    if level_type == 'support':
-                        support_levels.append(level_price)
-                    else:
-                        resistance_levels.append(level_price)
+            # Count price touches around each level (0.2% tolerance)
+            support_touches = _count_touches(low_values, support_prices, 0.002)
+            resistance_touches = _count_touches(high_values, resistance_prices, 0.002)
             
             return {
-                'support': sorted(list(set(support_levels))),
-                'resistance': sorted(list(set(resistance_levels)))
+                'support': sorted(set(support_prices[support_touches >= num_touches].tolist())),
+                'resistance': sorted(set(resistance_prices[resistance_touches >= num_touches].tolist()))
             }
         except Exception as e:
             print(f"Error calculating support/resistance: {str(e)}")
@@ -210,25 +223,19 @@ class TechnicalIndicators:
             if price_delta == 0:
                 price_delta = 0.00001  # Prevent division by zero
             
-            volume_profile = pd.Series(0.0, index=np.linspace(price_min, price_max, price_levels))
+            levels = np.linspace(price_min, price_max, price_levels)
             
-            # Distribute volume across price levels
-            for i in range(len(data)):
-                vol = data['volume'].iloc[i]
-                low = data['low'].iloc[i]
-                high = data['high'].iloc[i]
-                
-                # Handle cases where high equals low
-                if high == low:
-                    high = low * 1.00001  # Add small difference
-                
-                # Distribute volume proportionally across price range
-                for price in volume_profile.index:
-                    if low <= price <= high:
-                        try:
-                            volume_profile.loc[price] += vol / ((high - low) / price_delta)
-                        except (ZeroDivisionError, RuntimeWarning):
-                            volume_profile.loc[price] += vol  # Just add the volume if division fails
+            # Distribute volume proportionally across price range
+            volume_profile = pd.Series(
+                _distribute_volume(
+                    data['low'].to_numpy(dtype=np.float64),
+                    data['high'].to_numpy(dtype=np.float64),
+                    data['volume'].to_numpy(dtype=np.float64),
+                    levels,
+                    price_delta
+                ),
+                index=levels
+            )
             
             # Find POC (Point of Control) - price level with highest volume
             poc = volume_profile.idxmax()
@@ -236,21 +243,20 @@ class TechnicalIndicators:
             # Calculate Value Area (70% of volume)
             total_volume = volume_profile.sum()
             value_area_volume = total_volume * 0.7
-            cumulative_volume = 0
-            value_area_prices = []
             
-            # Sort volumes in descending order and accumulate until reaching value area volume
-            for price in volume_profile.sort_values(ascending=False).index:
-                cumulative_volume += volume_profile[price]
-                value_area_prices.append(price)
-                if cumulative_volume >= value_area_volume:
-                    break
+            # Sort volumes in descending order and accumulate until reaching
+            # value area volume; the level that crosses it is included
+            volumes = volume_profile.to_numpy()
+            sorted_idx = np.argsort(-volumes, kind='stable')
+            cumulative_volume = np.cumsum(volumes[sorted_idx])
+            cutoff = np.searchsorted(cumulative_volume, value_area_volume, side='left') + 1
+            value_area_prices = volume_profile.index.to_numpy()[sorted_idx[:cutoff]]
             
-            if not value_area_prices:
+            if not len(value_area_prices):
                 raise ValueError("No value area prices calculated")
             
-            value_area_high = max(value_area_prices)
-            value_area_low = min(value_area_prices)
+            value_area_high = value_area_prices.max()
+            value_area_low = value_area_prices.min()
             
             return {
                 'volume_profile': volume_profile,
@@ -288,15 +294,10 @@ class TechnicalIndicators:
             # Calculate returns
             returns = df.pct_change()
             
-            # Calculate rolling correlations with base token
-            correlations = pd.DataFrame()
-            base_returns = returns[base_token]
-            
-            for token in returns.columns:
-                if token != base_token:
-                    correlations[token] = returns[token].rolling(window).corr(base_returns)
-            
-            return correlations
+            # Calculate rolling correlations of every token with base token
+            # in one pass over the returns matrix
+            others = returns.drop(columns=[base_token])
+            return others.rolling(window).corr(returns[base_token])
         except Exception as e:
             print(f"Error calculating correlations: {str(e)}")
             return pd.DataFrame()
@@ -17,12 +17,13 @@ class FundamentalAnalyzer:
                     'metrics': {}
                 }
 
-            # Basic market metrics
+            # Basic market metrics, all read from the first row
+            first_row = market_data.iloc[0]
             metrics = {
                 'market_data': {
-                    'price': float(market_data['mark_price'].iloc[0]) if 'mark_price' in market_data.columns else None,
-                    'volume': float(market_data['quote_volume'].iloc[0]) if 'quote_volume' in market_data.columns else None,
-                    'price_change': float(market_data['price_change_percent'].iloc[0]) if 'price_change_percent' in market_data.columns else None
+                    'price': float(first_row['mark_price']) if 'mark_price' in first_row.index else None,
+                    'volume': float(first_row['quote_volume']) if 'quote_volume' in first_row.index else None,
+                    'price_change': float(first_row['price_change_percent']) if 'price_change_percent' in first_row.index else None
                 }
             }
 
@@ -1,12 +1,76 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Union
-from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
 import traceback
 import os
-import json
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+def _compute_profile(lows: np.ndarray, highs: np.ndarray, closes: np.ndarray,
+                     volumes: np.ndarray, num_bins: int) -> Optional[Tuple[np.ndarray, np.ndarray, float, float, float, float]]:
+    """
+    Bin volume by close price and locate the POC and 70% value area.
+    Returns (price_levels, volume_profile, poc, value_area_high,
+    value_area_low, total_volume), or None without volume.
+    """
+    # Calculate price range
+    price_min = np.nanmin(lows)
+    price_max = np.nanmax(highs)
+    
+    # Add small buffer to prevent identical min/max
+    if price_min == price_max:
+        price_max *= 1.001
+        price_min *= 0.999
+    
+    price_range = np.linspace(price_min, price_max, num_bins)
+    
+    # Distribute volume across price levels: find every close's bin at
+    # once and sum the volumes per bin
+    bin_idx = np.digitize(closes, price_range) - 1
+    in_range = (bin_idx >= 0) & (bin_idx < num_bins)
+    volume_profile = np.bincount(bin_idx[in_range], weights=volumes[in_range], minlength=num_bins)
+    
+    total_volume = volume_profile.sum()
+    if total_volume == 0:
+        return None
+    
+    # Find POC (Point of Control)
+    poc_price = price_range[np.argmax(volume_profile)]
+    
+    # Calculate Value Area (70% of volume)
+    sorted_idx = np.argsort(volume_profile)[::-1]
+    cumsum_volume = np.cumsum(volume_profile[sorted_idx])
+    value_area_idx = sorted_idx[cumsum_volume <= total_volume * 0.7]
+    
+    if len(value_area_idx) == 0:
+        value_area_high = price_max
+        value_area_low = price_min
+    else:
+        value_area_prices = price_range[value_area_idx]
+        value_area_high = value_area_prices.max()
+        value_area_low = value_area_prices.min()
+    
+    return price_range, volume_profile, poc_price, value_area_high, value_area_low, total_volume
 
 class MarketAnalyzer:
+    CACHE_TTL = 3600  # Seconds before cached market data is refetched
+    MEMORY_CACHE_SIZE = 256  # Symbol/timeframe frames kept in memory
+    ORDER_BOOK_TTL = 5  # Seconds an order book snapshot is reused
+    
+    # In-process copy of cached frames, dated like the files on disk. Kept
+    # on the class so it outlives Streamlit reruns and is shared by every
+    # analyzer instance and fetch thread
+    _memory_cache = OrderedDict()
+    _memory_cache_lock = threading.Lock()
+    # Latest parsed order book per (symbol, levels), shared the same way
+    _order_book_cache = {}
+    _order_book_cache_lock = threading.Lock()
+    # Timeframe fetches are independent blocking HTTP calls; one worker per
+    # supported timeframe, shared the same way
+    _executor = ThreadPoolExecutor(max_workers=6)
+    
     def __init__(self, binance_client):
         """
         Initialize MarketAnalyzer with Binance client
@@ -17,6 +81,7 @@ class MarketAnalyzer:
         self.timeframes = ['1m', '5m', '15m', '1h', '4h', '1d']
         self.data_dir = 'data/market_data'
         self._ensure_data_directory()
+        self._path_cache = {}
 
     def _ensure_data_directory(self):
         """Ensure the data directory exists"""
@@ -25,44 +90,74 @@ class MarketAnalyzer:
 
     def _get_cache_filename(self, symbol: str, timeframe: str) -> str:
         """Get the cache filename for a symbol and timeframe"""
-        return os.path.join(self.data_dir, f"{symbol}_{timeframe}.json")
+        key = (symbol, timeframe)
+        path = self._path_cache.get(key)
+        if path is None:
+            path = self._path_cache[key] = os.path.join(self.data_dir, f"{symbol}_{timeframe}.feather")
+        return path
 
     def _save_to_cache(self, symbol: str, timeframe: str, data: pd.DataFrame):
         """Save market data to cache"""
         try:
             cache_file = self._get_cache_filename(symbol, timeframe)
-            data_dict = {
-                'last_updated': datetime.now().isoformat(),
-                'data': data.reset_index().to_dict(orient='records')
-            }
-            with open(cache_file, 'w') as f:
-                json.dump(data_dict, f)
+            # Columnar binary file, left uncompressed since kline floats barely
+            # compress; its modification time marks the last update
+            data.reset_index().to_feather(cache_file, compression='uncompressed')
+            self._remember(symbol, timeframe, data.copy(deep=False), time.time())
         except Exception as e:
             print(f"Error saving to cache: {str(e)}")
 
     def _load_from_cache(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
         """Load market data from cache if available and recent"""
         try:
+            # Skip the disk entirely for frames already held in memory
+            df = self._recall(symbol, timeframe)
+            if df is not None:
+                return df
+            
             cache_file = self._get_cache_filename(symbol, timeframe)
-            if not os.path.exists(cache_file):
+            # A single stat both checks the file exists and dates it
+            try:
+                last_updated = os.path.getmtime(cache_file)
+            except FileNotFoundError:
                 return None
 
-            with open(cache_file, 'r') as f:
-                cached_data = json.load(f)
-
-            last_updated = datetime.fromisoformat(cached_data['last_updated'])
             # Check if cache is recent (less than 1 hour old)
-            if (datetime.now() - last_updated).total_seconds() < 3600:
-                df = pd.DataFrame(cached_data['data'])
+            if time.time() - last_updated < self.CACHE_TTL:
+                df = pd.read_feather(cache_file)
                 if not df.empty:
-                    df['timestamp'] = pd.to_datetime(df['timestamp'])
+                    # Column types, including the timestamp, are stored as is
                     df.set_index('timestamp', inplace=True)
-                    return df
+                    self._remember(symbol, timeframe, df, last_updated)
+                    return df.copy(deep=False)
             return None
         except Exception as e:
             print(f"Error loading from cache: {str(e)}")
             return None
 
+    def _remember(self, symbol: str, timeframe: str, data: pd.DataFrame, last_updated: float):
+        """Keep a frame in memory along with the time it was last updated"""
+        key = (symbol, timeframe)
+        with self._memory_cache_lock:
+            self._memory_cache[key] = (last_updated, data)
+            self._memory_cache.move_to_end(key)
+            if len(self._memory_cache) > self.MEMORY_CACHE_SIZE:
+                self._memory_cache.popitem(last=False)
+
+    def _recall(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
+        """Get a frame kept in memory if it is still within the cache TTL"""
+        key = (symbol, timeframe)
+        with self._memory_cache_lock:
+            entry = self._memory_cache.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[0] >= self.CACHE_TTL:
+                del self._memory_cache[key]
+                return None
+            self._memory_cache.move_to_end(key)
+        # Shallow copy so callers can't rebind columns of the kept frame
+        return entry[1].copy(deep=False)
+
     def get_multi_timeframe_data(self, symbol: str, 
                                timeframes: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
         """
@@ -78,19 +173,16 @@ class MarketAnalyzer:
         
         data = {}
         try:
-            for tf in timeframes:
-                print(f"Fetching data for {symbol} on {tf} timeframe...")
-                # Try to load from cache first
-                df = self._load_from_cache(symbol, tf)
-                
-                if df is None:
-                    # If not in cache or cache is old, fetch from API
-                    df = self.client.get_market_data(symbol, tf)
-                    if df is not None and not df.empty:
-                        # Save to cache for future use
-                        self._save_to_cache(symbol, tf, df)
-                        data[tf] = df
-                else:
+            # Fetch all timeframes concurrently, collecting in request order
+            futures = [(tf, self._executor.submit(self._fetch_timeframe, symbol, tf)) for tf in timeframes]
+            for tf, future in futures:
+                # A failed timeframe must not discard the others already fetched
+                try:
+                    df = future.result()
+                except Exception as e:
+                    print(f"Error fetching {symbol} on {tf} timeframe: {str(e)}")
+                    continue
+                if df is not None:
                     data[tf] = df
             
             if not data:
@@ -102,6 +194,22 @@ class MarketAnalyzer:
             print(f"Traceback: {traceback.format_exc()}")
             return data
 
+    def _fetch_timeframe(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
+        """Get market data for one timeframe from cache or, failing that, the API"""
+        print(f"Fetching data for {symbol} on {timeframe} timeframe...")
+        # Try to load from cache first
+        df = self._load_from_cache(symbol, timeframe)
+        if df is not None:
+            return df
+        
+        # If not in cache or cache is old, fetch from API
+        df = self.client.get_market_data(symbol, timeframe)
+        if df is not None and not df.empty:
+            # Save to cache for future use
+            self._save_to_cache(symbol, timeframe, df)
+            return df
+        return None
+
     def analyze_order_book_depth(self, symbol: str, levels: int = 20) -> Dict[str, Union[float, Dict]]:
         """
         Get raw order book data
@@ -112,33 +220,42 @@ class MarketAnalyzer:
             Dictionary containing raw order book data
         """
         try:
-            print(f"Getting order book for {symbol}...")
-            # Get raw order book data
-            depth = self.client._make_request('depth', params={
-                'symbol': symbol,
-                'limit': levels
-            })
-            
-            if not depth or 'bids' not in depth or 'asks' not in depth:
-                print(f"Warning: Invalid order book data received for {symbol}")
-                return None
-            
-            # Convert string values to float
-            bids = [{'price': float(price), 'quantity': float(qty)} 
-                   for price, qty in depth['bids']]
-            asks = [{'price': float(price), 'quantity': float(qty)} 
-                   for price, qty in depth['asks']]
+            # Reuse a snapshot fetched within the last few seconds so callers
+            # analyzing the same symbol don't each hit the depth endpoint
+            key = (symbol, levels)
+            with self._order_book_cache_lock:
+                entry = self._order_book_cache.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ORDER_BOOK_TTL:
+                bid_levels, ask_levels = entry[1], entry[2]
+            else:
+                print(f"Getting order book for {symbol}...")
+                # Get raw order book data
+                depth = self.client._make_request('depth', params={
+                    'symbol': symbol,
+                    'limit': levels
+                })
+                
+                if not depth or 'bids' not in depth or 'asks' not in depth:
+                    print(f"Warning: Invalid order book data received for {symbol}")
+                    return None
+                
+                # Convert string values to float in one pass per side;
+                # rows are (price, quantity)
+                bid_levels = np.asarray(depth['bids'], dtype=np.float64)
+                ask_levels = np.asarray(depth['asks'], dtype=np.float64)
+                with self._order_book_cache_lock:
+                    self._order_book_cache[key] = (time.monotonic(), bid_levels, ask_levels)
             
             # Calculate basic spread info for UI display
-            best_bid = float(depth['bids'][0][0])
-            best_ask = float(depth['asks'][0][0])
+            best_bid = float(bid_levels[0, 0])
+            best_ask = float(ask_levels[0, 0])
             spread = best_ask - best_bid
             spread_percentage = (spread / best_bid) * 100
             
             # Return raw data with minimal processing
             return {
-                'bids': bids,
-                'asks': asks,
+                'bids': [{'price': price, 'quantity': qty} for price, qty in bid_levels.tolist()],
+                'asks': [{'price': price, 'quantity': qty} for price, qty in ask_levels.tolist()],
                 'spread_percentage': spread_percentage,
                 # Keep these for UI display only
                 'buy_pressure': 50.0,  # Neutral default
@@ -176,51 +293,19 @@ class MarketAnalyzer:
                 print(f"Analyzing volume profile for {symbol} on {tf} timeframe...")
                 if data is not None and not data.empty:
                     try:
-                        # Calculate price range
-                        price_min = data['low'].min()
-                        price_max = data['high'].max()
-                        
-                        # Add small buffer to prevent identical min/max
-                        if price_min == price_max:
-                            price_max *= 1.001
-                            price_min *= 0.999
-                        
-                        price_range = np.linspace(price_min, price_max, num_bins)
-                        
-                        # Initialize volume profile
-                        volume_profile = np.zeros(num_bins)
-                        
-                        # Distribute volume across price levels
-                        for i in range(len(data)):
-                            vol = data['volume'].iloc[i]
-                            price = data['close'].iloc[i]
-                            
-                            # Find the appropriate price bin
-                            bin_idx = np.digitize(price, price_range) - 1
-                            if 0 <= bin_idx < num_bins:
-                                volume_profile[bin_idx] += vol
-                        
-                        if volume_profile.sum() == 0:
-                            raise ValueError("No volume data available")
-                        
-                        # Find POC (Point of Control)
-                        poc_idx = np.argmax(volume_profile)
-                        poc_price = price_range[poc_idx]
-                        
-                        # Calculate Value Area (70% of volume)
-                        total_volume = volume_profile.sum()
-                        sorted_idx = np.argsort(volume_profile)[::-1]
-                        cumsum_volume = np.cumsum(volume_profile[sorted_idx])
-                        value_area_idx = sorted_idx[cumsum_volume <= total_volume * 0.7]
-                        
-                        if len(value_area_idx) == 0:
-                            value_area_high = price_max
-                            value_area_low = price_min
-                        else:
-                            value_area_prices = price_range[value_area_idx]
-                            value_area_high = value_area_prices.max()
-                            value_area_low = value_area_prices.min()
+                        profile = _compute_profile(
+                            data['low'].to_numpy(dtype=np.float64),
+                            data['high'].to_numpy(dtype=np.float64),
+                            data['close'].to_numpy(dtype=np.float64),
+                            data['volume'].to_numpy(dtype=np.float64),
+                            num_bins
+                        )
+                        if profile is None:
+                            print(f"Error processing volume profile for {tf}: No volume data available")
+                            profiles[tf] = self._get_default_profile(data)
+                            continue
                         
+                        price_range, volume_profile, poc_price, value_area_high, value_area_low, total_volume = profile
                         profiles[tf] = {
                             'price_levels': price_range.tolist(),
                             'volume_profile': volume_profile.tolist(),
@@ -4,30 +4,179 @@ from typing import Dict, List, Optional, Tuple
 
 class CandlestickPatterns:
     @staticmethod
-    def _body_length(open_price: float, close_price: float) -> float:
+    def _body_length(open_price: np.ndarray, close_price: np.ndarray) -> np.ndarray:
         """Calculate candle body length"""
-        return abs(close_price - open_price)
+        return np.abs(close_price - open_price)
     
     @staticmethod
-    def _upper_shadow(open_price: float, close_price: float, high_price: float) -> float:
+    def _upper_shadow(open_price: np.ndarray, close_price: np.ndarray, high_price: np.ndarray) -> np.ndarray:
         """Calculate upper shadow length"""
-        return high_price - max(open_price, close_price)
+        return high_price - np.maximum(open_price, close_price)
     
     @staticmethod
-    def _lower_shadow(open_price: float, close_price: float, low_price: float) -> float:
+    def _lower_shadow(open_price: np.ndarray, close_price: np.ndarray, low_price: np.ndarray) -> np.ndarray:
         """Calculate lower shadow length"""
-        return min(open_price, close_price) - low_price
+        return np.minimum(open_price, close_price) - low_price
     
     @staticmethod
-    def _is_bullish(open_price: float, close_price: float) -> bool:
+    def _is_bullish(open_price: np.ndarray, close_price: np.ndarray) -> np.ndarray:
         """Check if candle is bullish"""
         return close_price > open_price
     
     @staticmethod
-    def _is_bearish(open_price: float, close_price: float) -> bool:
+    def _is_bearish(open_price: np.ndarray, close_price: np.ndarray) -> np.ndarray:
         """Check if candle is bearish"""
         return close_price < open_price
 
+    @staticmethod
+    def _ohlc_arrays(data: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Get open, high, low and close columns as float64 arrays"""
+        return tuple(data[col].to_numpy(dtype=np.float64) for col in ('open', 'high', 'low', 'close'))
+
+    @classmethod
+    def _doji_signals(cls, opens: np.ndarray, highs: np.ndarray, lows: np.ndarray,
+                      closes: np.ndarray, tolerance: float = 0.1) -> np.ndarray:
+        """Doji signals (1 for Doji) from OHLC arrays"""
+        body = cls._body_length(opens, closes)
+        upper_shadow = cls._upper_shadow(opens, closes, highs)
+        lower_shadow = cls._lower_shadow(opens, closes, lows)
+        
+        # Check if body is very small compared to shadows; candles with
+        # missing prices compare False and stay 0
+        total_shadow = upper_shadow + lower_shadow
+        is_doji = (total_shadow > 0) & (body <= total_shadow * tolerance)
+        
+        return is_doji.astype(np.int8)
+
+    @classmethod
+    def _hammer_signals(cls, opens: np.ndarray, highs: np.ndarray, lows: np.ndarray,
+                        closes: np.ndarray, body_ratio: float = 0.3, shadow_ratio: float = 2.0) -> np.ndarray:
+        """Hammer signals (1 for hammer) from OHLC arrays"""
+        body = cls._body_length(opens, closes)
+        upper_shadow = cls._upper_shadow(opens, closes, highs)
+        lower_shadow = cls._lower_shadow(opens, closes, lows)
+        total_length = upper_shadow + body + lower_shadow
+        
+        # Zero-length candles are masked out rather than divided by
+        with np.errstate(divide='ignore', invalid='ignore'):
+            body_share = body / total_length
+        
+        # Check hammer criteria
+        is_hammer = ((total_length > 0) &
+                     (body_share <= body_ratio) &
+                     (lower_shadow >= body * shadow_ratio) &
+                     (upper_shadow <= body * 0.1))
+        
+        return is_hammer.astype(np.int8)
+
+    @classmethod
+    def _engulfing_signals(cls, opens: np.ndarray, highs: np.ndarray, lows: np.ndarray,
+                           closes: np.ndarray) -> np.ndarray:
+        """Engulfing signals (1 bullish, -1 bearish) from OHLC arrays"""
+        # The first candle has no predecessor and stays 0
+        signals = np.zeros(len(opens), dtype=np.int8)
+        if len(opens) <= 1:  # No pair of candles to compare
+            return signals
+        
+        # Line each candle up with the one before it
+        prev_open, prev_close = opens[:-1], closes[:-1]
+        curr_open, curr_close = opens[1:], closes[1:]
+        prev_body = cls._body_length(prev_open, prev_close)
+        curr_body = cls._body_length(curr_open, curr_close)
+        
+        # Bullish Engulfing
+        bullish = (cls._is_bearish(prev_open, prev_close) &
+                   cls._is_bullish(curr_open, curr_close) &
+                   (curr_open <= prev_close) &
+                   (curr_close >= prev_open) &
+                   (curr_body > prev_body))
+        
+        # Bearish Engulfing
+        bearish = (cls._is_bullish(prev_open, prev_close) &
+                   cls._is_bearish(curr_open, curr_close) &
+                   (curr_open >= prev_close) &
+                   (curr_close <= prev_open) &
+                   (curr_body > prev_body))
+        
+        signals[1:] = np.select([bullish, bearish], [1, -1], 0)
+        
+        return signals
+
+    @classmethod
+    def _star_signals(cls, opens: np.ndarray, highs: np.ndarray, lows: np.ndarray,
+                      closes: np.ndarray, doji_tolerance: float = 0.1) -> np.ndarray:
+        """Star signals (1 morning, -1 evening) from OHLC arrays"""
+        # The first two candles can't close a pattern and stay 0
+        signals = np.zeros(len(opens), dtype=np.int8)
+        if len(opens) <= 2:  # No full three-candle window
+            return signals
+        
+        # Line up each three-candle window: first, middle and last
+        first_open, first_close = opens[:-2], closes[:-2]
+        mid_open, mid_close = opens[1:-1], closes[1:-1]
+        last_open, last_close = opens[2:], closes[2:]
+        
+        # Check middle candle for doji-like properties
+        middle_body = cls._body_length(mid_open, mid_close)
+        middle_shadows = (cls._upper_shadow(mid_open, mid_close, highs[1:-1]) +
+                          cls._lower_shadow(mid_open, mid_close, lows[1:-1]))
+        
+        is_small_body = (middle_shadows > 0) & (middle_body <= middle_shadows * doji_tolerance)
+        first_midpoint = (first_open + first_close) / 2
+        
+        # Morning Star
+        morning = (cls._is_bearish(first_open, first_close) &
+                   is_small_body &
+                   cls._is_bullish(last_open, last_close) &
+                   (last_close > first_midpoint))
+        
+        # Evening Star
+        evening = (cls._is_bullish(first_open, first_close) &
+                   is_small_body &
+                   cls._is_bearish(last_open, last_close) &
+                   (last_close < first_midpoint))
+        
+        signals[2:] = np.select([morning, evening], [1, -1], 0)
+        
+        return signals
+
+    @classmethod
+    def _three_line_strike_signals(cls, opens: np.ndarray, highs: np.ndarray, lows: np.ndarray,
+                                   closes: np.ndarray) -> np.ndarray:
+        """Three Line Strike signals (1 bullish, -1 bearish) from OHLC arrays"""
+        # The first three candles can't close a pattern and stay 0
+        signals = np.zeros(len(opens), dtype=np.int8)
+        if len(opens) <= 3:  # No full four-candle window
+            return signals
+        
+        # Line up each four-candle window, oldest (3 bars back) to current
+        open_3, close_3 = opens[:-3], closes[:-3]
+        open_2, close_2 = opens[1:-2], closes[1:-2]
+        open_1, close_1 = opens[2:-1], closes[2:-1]
+        open_0, close_0 = opens[3:], closes[3:]
+        
+        # Bullish Three Line Strike
+        bullish = (cls._is_bearish(open_3, close_3) &
+                   cls._is_bearish(open_2, close_2) &
+                   cls._is_bearish(open_1, close_1) &
+                   (close_2 < close_3) &
+                   (close_1 < close_2) &
+                   cls._is_bullish(open_0, close_0) &
+                   (close_0 > open_3))
+        
+        # Bearish Three Line Strike
+        bearish = (cls._is_bullish(open_3, close_3) &
+                   cls._is_bullish(open_2, close_2) &
+                   cls._is_bullish(open_1, close_1) &
+                   (close_2 > close_3) &
+                   (close_1 > close_2) &
+                   cls._is_bearish(open_0, close_0) &
+                   (close_0 < open_3))
+        
+        signals[3:] = np.select([bullish, bearish], [1, -1], 0)
+        
+        return signals
+
     @classmethod
     def identify_doji(cls, data: pd.DataFrame, tolerance: float = 0.1) -> pd.Series:
         """
@@ -39,23 +188,7 @@ class CandlestickPatterns:
             Series with Doji signals (1 for Doji)
         """
         try:
-            signals = pd.Series(0, index=data.index)
-            
-            for i in range(len(data)):
-                try:
-                    body = cls._body_length(data['open'].iloc[i], data['close'].iloc[i])
-                    upper_shadow = cls._upper_shadow(data['open'].iloc[i], data['close'].iloc[i], data['high'].iloc[i])
-                    lower_shadow = cls._lower_shadow(data['open'].iloc[i], data['close'].iloc[i], data['low'].iloc[i])
-                    
-                    # Check if body is very small compared to shadows
-                    total_shadow = upper_shadow + lower_shadow
-                    if total_shadow > 0 and body <= total_shadow * tolerance:
-                        signals.iloc[i] = 1
-                except Exception as e:
-                    print(f"Error processing Doji at index {i}: {str(e)}")
-                    continue
-            
-            return signals
+            return pd.Series(cls._doji_signals(*cls._ohlc_arrays(data), tolerance), index=data.index)
         except Exception as e:
             print(f"Error identifying Doji patterns: {str(e)}")
             return pd.Series(0, index=data.index)
@@ -73,26 +206,7 @@ class CandlestickPatterns:
             Series with Hammer signals (1 for hammer)
         """
         try:
-            signals = pd.Series(0, index=data.index)
-            
-            for i in range(len(data)):
-                try:
-                    body = cls._body_length(data['open'].iloc[i], data['close'].iloc[i])
-                    upper_shadow = cls._upper_shadow(data['open'].iloc[i], data['close'].iloc[i], data['high'].iloc[i])
-                    lower_shadow = cls._lower_shadow(data['open'].iloc[i], data['close'].iloc[i], data['low'].iloc[i])
-                    total_length = upper_shadow + body + lower_shadow
-                    
-                    if total_length > 0:  # Prevent division by zero
-                        # Check hammer criteria
-                        if (body / total_length <= body_ratio and 
-                            lower_shadow >= body * shadow_ratio and 
-                            upper_shadow <= body * 0.1):
-                            signals.iloc[i] = 1
-                except Exception as e:
-                    print(f"Error processing Hammer at index {i}: {str(e)}")
-                    continue
-            
-            return signals
+            return pd.Series(cls._hammer_signals(*cls._ohlc_arrays(data), body_ratio, shadow_ratio), index=data.index)
         except Exception as e:
             print(f"Error identifying Hammer patterns: {str(e)}")
             return pd.Series(0, index=data.index)
@@ -107,33 +221,7 @@ class CandlestickPatterns:
             Series with Engulfing signals (1 for bullish, -1 for bearish)
         """
         try:
-            signals = pd.Series(0, index=data.index)
-            
-            for i in range(1, len(data)):
-                try:
-                    prev_body = cls._body_length(data['open'].iloc[i-1], data['close'].iloc[i-1])
-                    curr_body = cls._body_length(data['open'].iloc[i], data['close'].iloc[i])
-                    
-                    # Bullish Engulfing
-                    if (cls._is_bearish(data['open'].iloc[i-1], data['close'].iloc[i-1]) and
-                        cls._is_bullish(data['open'].iloc[i], data['close'].iloc[i]) and
-                        data['open'].iloc[i] <= data['close'].iloc[i-1] and
-                        data['close'].iloc[i] >= data['open'].iloc[i-1] and
-                        curr_body > prev_body):
-                        signals.iloc[i] = 1
-                    
-                    # Bearish Engulfing
-                    elif (cls._is_bullish(data['open'].iloc[i-1], data['close'].iloc[i-1]) and
-                          cls._is_bearish(data['open'].iloc[i], data['close'].iloc[i]) and
-                          data['open'].iloc[i] >= data['close'].iloc[i-1] and
-                          data['close'].iloc[i] <= data['open'].iloc[i-1] and
-                          curr_body > prev_body):
-                        signals.iloc[i] = -1
-                except Exception as e:
-                    print(f"Error processing Engulfing at index {i}: {str(e)}")
-                    continue
-            
-            return signals
+            return pd.Series(cls._engulfing_signals(*cls._ohlc_arrays(data)), index=data.index)
         except Exception as e:
             print(f"Error identifying Engulfing patterns: {str(e)}")
             return pd.Series(0, index=data.index)
@@ -150,35 +238,7 @@ class CandlestickPatterns:
             Series with Star signals (1 for morning star, -1 for evening star)
         """
         try:
-            signals = pd.Series(0, index=data.index)
-            
-            for i in range(2, len(data)):
-                try:
-                    # Check middle candle for doji-like properties
-                    middle_body = cls._body_length(data['open'].iloc[i-1], data['close'].iloc[i-1])
-                    middle_shadows = (cls._upper_shadow(data['open'].iloc[i-1], data['close'].iloc[i-1], data['high'].iloc[i-1]) +
-                                    cls._lower_shadow(data['open'].iloc[i-1], data['close'].iloc[i-1], data['low'].iloc[i-1]))
-                    
-                    is_small_body = middle_shadows > 0 and middle_body <= middle_shadows * doji_tolerance
-                    
-                    # Morning Star
-                    if (cls._is_bearish(data['open'].iloc[i-2], data['close'].iloc[i-2]) and
-                        is_small_body and
-                        cls._is_bullish(data['open'].iloc[i], data['close'].iloc[i]) and
-                        data['close'].iloc[i] > (data['open'].iloc[i-2] + data['close'].iloc[i-2]) / 2):
-                        signals.iloc[i] = 1
-                    
-                    # Evening Star
-                    elif (cls._is_bullish(data['open'].iloc[i-2], data['close'].iloc[i-2]) and
-                          is_small_body and
-                          cls._is_bearish(data['open'].iloc[i], data['close'].iloc[i]) and
-                          data['close'].iloc[i] < (data['open'].iloc[i-2] + data['close'].iloc[i-2]) / 2):
-                        signals.iloc[i] = -1
-                except Exception as e:
-                    print(f"Error processing Star pattern at index {i}: {str(e)}")
-                    continue
-            
-            return signals
+            return pd.Series(cls._star_signals(*cls._ohlc_arrays(data), doji_tolerance), index=data.index)
         except Exception as e:
             print(f"Error identifying Star patterns: {str(e)}")
             return pd.Series(0, index=data.index)
@@ -193,34 +253,7 @@ class CandlestickPatterns:
             Series with Three Line Strike signals (1 for bullish, -1 for bearish)
         """
         try:
-            signals = pd.Series(0, index=data.index)
-            
-            for i in range(3, len(data)):
-                try:
-                    # Bullish Three Line Strike
-                    if (cls._is_bearish(data['open'].iloc[i-3], data['close'].iloc[i-3]) and
-                        cls._is_bearish(data['open'].iloc[i-2], data['close'].iloc[i-2]) and
-                        cls._is_bearish(data['open'].iloc[i-1], data['close'].iloc[i-1]) and
-                        data['close'].iloc[i-2] < data['close'].iloc[i-3] and
-                        data['close'].iloc[i-1] < data['close'].iloc[i-2] and
-                        cls._is_bullish(data['open'].iloc[i], data['close'].iloc[i]) and
-                        data['close'].iloc[i] > data['open'].iloc[i-3]):
-                        signals.iloc[i] = 1
-                    
-                    # Bearish Three Line Strike
-                    elif (cls._is_bullish(data['open'].iloc[i-3], data['close'].iloc[i-3]) and
-                          cls._is_bullish(data['open'].iloc[i-2], data['close'].iloc[i-2]) and
-                          cls._is_bullish(data['open'].iloc[i-1], data['close'].iloc[i-1]) and
-                          data['close'].iloc[i-2] > data['close'].iloc[i-3] and
-                          data['close'].iloc[i-1] > data['close'].iloc[i-2] and
-                          cls._is_bearish(data['open'].iloc[i], data['close'].iloc[i]) and
-                          data['close'].iloc[i] < data['open'].iloc[i-3]):
-                        signals.iloc[i] = -1
-                except Exception as e:
-                    print(f"Error processing Three Line Strike at index {i}: {str(e)}")
-                    continue
-            
-            return signals
+            return pd.Series(cls._three_line_strike_signals(*cls._ohlc_arrays(data)), index=data.index)
         except Exception as e:
             print(f"Error identifying Three Line Strike patterns: {str(e)}")
             return pd.Series(0, index=data.index)
@@ -238,12 +271,14 @@ class CandlestickPatterns:
             if data is None or data.empty:
                 raise ValueError("No data provided for pattern analysis")
 
+            # Pull the price columns out once and share them across patterns
+            ohlc = cls._ohlc_arrays(data)
             return {
-                'doji': cls.identify_doji(data),
-                'hammer': cls.identify_hammer(data),
-                'engulfing': cls.identify_engulfing(data),
-                'star': cls.identify_morning_evening_star(data),
-                'three_line_strike': cls.identify_three_line_strike(data)
+                'doji': pd.Series(cls._doji_signals(*ohlc), index=data.index),
+                'hammer': pd.Series(cls._hammer_signals(*ohlc), index=data.index),
+                'engulfing': pd.Series(cls._engulfing_signals(*ohlc), index=data.index),
+                'star': pd.Series(cls._star_signals(*ohlc), index=data.index),
+                'three_line_strike': pd.Series(cls._three_line_strike_signals(*ohlc), index=data.index)
             }
         except Exception as e:
             print(f"Error scanning patterns: {str(e)}")
@@ -3,6 +3,25 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 
+def _trailing_means(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Mean of every full window, aligned to its last value, from one pass of
+    running sums; NaN where the window holds a missing value
+    """
+    if len(values) < window:
+        return np.empty(0)
+    missing = np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(missing, 0.0, values))))
+    gaps = np.concatenate(([0], np.cumsum(missing)))
+    means = (sums[window:] - sums[:-window]) / window
+    means[gaps[window:] != gaps[:-window]] = np.nan
+    return means
+
+def _mean_skipna(values: np.ndarray) -> float:
+    """Mean ignoring NaN, or NaN when nothing is left"""
+    values = values[~np.isnan(values)]
+    return values.mean() if len(values) else np.nan
+
 class RiskAnalyzer:
     def __init__(self):
         """Initialize RiskAnalyzer with risk assessment parameters"""
@@ -57,18 +76,20 @@ class RiskAnalyzer:
             returns = data['close'].pct_change().dropna()
             
             # Calculate ATR-based volatility
-            high_low = data['high'] - data['low']
-            high_close = abs(data['high'] - data['close'].shift())
-            low_close = abs(data['low'] - data['close'].shift())
-            ranges = pd.concat([high_low, high_close, low_close], axis=1)
-            true_range = ranges.max(axis=1)
-            atr = true_range.rolling(window=14).mean().iloc[-1]
+            highs = data['high'].to_numpy(dtype=np.float64)
+            lows = data['low'].to_numpy(dtype=np.float64)
+            closes = data['close'].to_numpy(dtype=np.float64)
+            prev_close = np.concatenate(([np.nan], closes[:-1]))
+            # fmax skips missing values, so the first bar's range is just high - low
+            true_range = np.fmax.reduce([highs - lows, np.abs(highs - prev_close), np.abs(lows - prev_close)])
+            # Only the latest 14-bar average is used
+            atr = true_range[-14:].mean() if len(true_range) >= 14 else np.nan
             
             # Combine with standard deviation of returns
             volatility = np.std(returns) * np.sqrt(252)  # Annualized volatility
             
             # Normalize and combine metrics
-            normalized_atr = min(atr / data['close'].iloc[-1], 1)
+            normalized_atr = min(atr / closes[-1], 1)
             normalized_vol = min(volatility, 1)
             
             return (normalized_atr + normalized_vol) / 2
@@ -107,14 +128,23 @@ class RiskAnalyzer:
     def _calculate_volume_stability(self, data: pd.DataFrame) -> float:
         """Calculate volume stability score"""
         try:
-            # Calculate volume moving average
-            volume_sma = data['volume'].rolling(window=20).mean()
-            
-            # Calculate volume volatility
-            volume_volatility = data['volume'].rolling(window=20).std() / volume_sma
-            
+            volumes = data['volume'].to_numpy(dtype=np.float64)
+            if len(volumes) < 20:
+                # No full window, so no volatility to average
+                return np.nan
+
+            # Every 20-bar window as a row of a strided view (no copy); a
+            # missing volume makes its windows NaN, as a rolling window would
+            windows = np.lib.stride_tricks.sliding_window_view(volumes, 20)
+
+            # Calculate volume moving average and volatility; all-zero
+            # windows give 0/0 and are skipped below
+            volume_sma = windows.mean(axis=1)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                volume_volatility = windows.std(axis=1, ddof=1) / volume_sma
+
             # Calculate stability score (inverse of volatility)
-            stability = 1 / (1 + volume_volatility.mean())
+            stability = 1 / (1 + _mean_skipna(volume_volatility))
             
             return min(max(stability, 0), 1)
         except Exception as e:
@@ -124,17 +154,20 @@ class RiskAnalyzer:
     def _calculate_price_stability(self, data: pd.DataFrame) -> Dict:
         """Calculate price stability metrics"""
         try:
-            # Calculate price moving averages
-            sma_20 = data['close'].rolling(window=20).mean()
-            sma_50 = data['close'].rolling(window=50).mean()
+            closes = data['close'].to_numpy(dtype=np.float64)
+            
+            # Calculate price moving averages, one per full window
+            sma_20 = _trailing_means(closes, 20)
+            sma_50 = _trailing_means(closes, 50)
             
             # Calculate price deviation from moving averages
-            deviation_20 = abs(data['close'] - sma_20) / sma_20
-            deviation_50 = abs(data['close'] - sma_50) / sma_50
+            with np.errstate(divide='ignore', invalid='ignore'):
+                deviation_20 = np.abs(closes[19:] - sma_20) / sma_20
+                deviation_50 = np.abs(closes[49:] - sma_50) / sma_50
             
             # Calculate stability scores
-            short_term_stability = 1 / (1 + deviation_20.mean())
-            long_term_stability = 1 / (1 + deviation_50.mean())
+            short_term_stability = 1 / (1 + _mean_skipna(deviation_20))
+            long_term_stability = 1 / (1 + _mean_skipna(deviation_50))
             
             return {
                 'short_term': float(short_term_stability),
@@ -188,14 +221,17 @@ class RiskAnalyzer:
             if total_volume == 0:
                 return {'support_strength': 0.0, 'resistance_strength': 0.0}
 
-            # Calculate volume concentration at support/resistance
-            value_area_volume = sum(
-                vol for vol, price in zip(
-                    volume_profile.get('volume_profile', []),
-                    volume_profile.get('price_levels', [])
-                )
-                if volume_profile['value_area_low'] <= price <= volume_profile['value_area_high']
-            )
+            # Calculate volume concentration at support/resistance, pairing
+            # volumes with price levels up to the shorter of the two
+            volumes = np.asarray(volume_profile.get('volume_profile', []), dtype=np.float64)
+            prices = np.asarray(volume_profile.get('price_levels', []), dtype=np.float64)
+            levels = min(len(volumes), len(prices))
+            value_area_volume = 0
+            if levels:
+                volumes, prices = volumes[:levels], prices[:levels]
+                in_value_area = ((prices >= volume_profile['value_area_low']) &
+                                 (prices <= volume_profile['value_area_high']))
+                value_area_volume = volumes[in_value_area].sum()
             
             value_area_strength = value_area_volume / total_volume if total_volume > 0 else 0
             
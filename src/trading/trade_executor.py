@@ -13,13 +13,11 @@ class TradeExecutor:
         """Execute trade based on chatbase recommendation"""
         try:
             # Get current market price for value calculation
-            market_data = self.client.get_market_data(symbol)
-            if market_data is None:
+            current_price = self.client.get_last_price(symbol)
+            if current_price is None:
                 st.error("Could not get current market price")
                 return False
             
-            current_price = float(market_data['last_price'].iloc[-1])
-            
             # Get symbol info for lot size validation
             exchange_info = self.client._make_request('exchangeInfo')
             lot_size_info = self._get_lot_size_filter(exchange_info, symbol)
@@ -187,9 +185,8 @@ class TradeExecutor:
                 return False
 
             # Check trade value
-            market_data = self.client.get_market_data(symbol)
-            if market_data is not None:
-                current_price = float(market_data['last_price'].iloc[-1])
+            current_price = self.client.get_last_price(symbol)
+            if current_price is not None:
                 trade_value = position_size * current_price
                 
                 if trade_value >= self.MAX_TRADE_VALUE: